@@ -24,6 +24,11 @@ from app.db.base import Base
 from app.db.models import *
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave views mapped read-only on the models to their own migrations."""
+    return not (type_ == "table" and object.info.get("is_view"))
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,6 +53,7 @@ def run_migrations_offline() -> None:
         context.configure(
             url=url,
             target_metadata=target_metadata,
+            include_object=include_object,
             literal_binds=True,
             dialect_opts={"paramstyle": "named"},
         )
@@ -77,7 +83,9 @@ def run_migrations_online() -> None:
 
         with connectable.connect() as connection:
             context.configure(
-                connection=connection, target_metadata=target_metadata
+                connection=connection,
+                target_metadata=target_metadata,
+                include_object=include_object
             )
 
             with context.begin_transaction():
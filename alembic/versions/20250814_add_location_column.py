@@ -15,43 +15,68 @@ down_revision = 'eb6845fcc5c9'
 branch_labels = None
 depends_on = None
 
+# Rows rewritten per statement when backfilling columns
+BACKFILL_BATCH_SIZE = 30000
+
 def upgrade():
     # 1. Enable PostGIS extension (required for geography type)
     op.execute('CREATE EXTENSION IF NOT EXISTS postgis;')
     
-    # 2. Add the new location column (PostGIS Geography type)
-    op.add_column('media', 
-        sa.Column('location', Geography(geometry_type='POINT', srid=4326), nullable=True)
-    )
-    
-    # 3. Populate location from existing lat/lng
+    # 2. Build the new table in a single pass, computing location from lat/lng
+    #    instead of ADD COLUMN + full-table UPDATE + two DROP COLUMN rewrites
     op.execute("""
-        UPDATE media
-        SET location = ST_SetSRID(ST_MakePoint(lng::double precision, lat::double precision), 4326)::geography
-        WHERE lng IS NOT NULL AND lat IS NOT NULL;
+        CREATE TABLE media_new AS
+        SELECT
+            id,
+            title,
+            description,
+            user_id,
+            created_at,
+            orientation,
+            trust_score,
+            file_path,
+            capture_time,
+            ST_SetSRID(ST_MakePoint(lng::double precision, lat::double precision), 4326)::geography(POINT, 4326) AS location
+        FROM media;
     """)
     
-    # 4. Optionally, set location column to NOT NULL if all rows have lat/lng
-    # Comment out if you have rows without lat/lng data
-    op.alter_column('media', 'location', nullable=False)
+    # 3. Recreate constraints and indexes on the new table
+    op.execute('ALTER TABLE media_new ALTER COLUMN location SET NOT NULL;')
+    op.execute('CREATE INDEX idx_media_new_location ON media_new USING GIST (location);')
     
-    # 5. Optional: drop old lat/lng columns if no longer needed
-    # Comment out if you want to keep them for compatibility
-    op.drop_column('media', 'lat')
-    op.drop_column('media', 'lng')
+    # 4. Swap the tables and restore the original constraint/index names
+    op.execute('DROP TABLE media;')
+    op.execute('ALTER TABLE media_new RENAME TO media;')
+    op.execute('ALTER TABLE media ADD CONSTRAINT media_pkey PRIMARY KEY (id);')
+    op.execute('ALTER INDEX idx_media_new_location RENAME TO idx_media_location;')
 
 def downgrade():
     # 1. Add lat/lng columns back
     op.add_column('media', sa.Column('lat', sa.Float, nullable=True))
     op.add_column('media', sa.Column('lng', sa.Float, nullable=True))
     
-    # 2. Populate lat/lng from location
-    op.execute("""
-        UPDATE media
-        SET lat = ST_Y(location::geometry),
-            lng = ST_X(location::geometry)
-        WHERE location IS NOT NULL;
-    """)
+    # 2. Populate lat/lng from location in bounded batches, committing each
+    #    one so no single statement rewrites (and locks) the whole table.
+    #    Rows that already hold the right values are never selected, so a
+    #    re-run after an interrupted downgrade skips the finished rows.
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        while True:
+            result = connection.execute(sa.text("""
+                UPDATE media
+                SET lat = ST_Y(location::geometry),
+                    lng = ST_X(location::geometry)
+                WHERE id IN (
+                    SELECT id FROM media
+                    WHERE location IS NOT NULL
+                      AND (lat IS DISTINCT FROM ST_Y(location::geometry)
+                           OR lng IS DISTINCT FROM ST_X(location::geometry))
+                    LIMIT :batch_size
+                );
+            """), {"batch_size": BACKFILL_BATCH_SIZE})
+            if result.rowcount == 0:
+                break
+            connection.execute(sa.text('VACUUM ANALYZE media;'))
     
     # 3. Drop location column
     op.drop_column('media', 'location')
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""Add GIST index on media.location
+
+Revision ID: 80f181c2d55c
+Revises: 9c8b7a6d5f4e
+Create Date: 2026-10-16 09:12:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '80f181c2d55c'
+down_revision: Union[str, Sequence[str], None] = '9c8b7a6d5f4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Same name GeoAlchemy2 uses for the spatial index it declares on the model
+    op.execute('CREATE INDEX IF NOT EXISTS idx_media_location ON media USING GIST (location);')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP INDEX IF EXISTS idx_media_location;')
@@ -0,0 +1,52 @@
+"""Use native enums for status and type columns
+
+Revision ID: a3f9c6e2d8b1
+Revises: f4d6b2e8a1c5
+Create Date: 2026-10-16 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f9c6e2d8b1'
+down_revision: Union[str, Sequence[str], None] = 'f4d6b2e8a1c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, enum type, labels, previous string length)
+ENUM_COLUMNS = (
+    ('claims', 'verified_status', 'claim_status',
+     ('pending', 'verified', 'debunked'), 20),
+    ('trust_metrics', 'metric_type', 'trust_metric_type',
+     ('user_trust', 'claim_credibility', 'verification_quality'), 50),
+    ('user_interactions', 'interaction_type', 'interaction_type',
+     ('vote', 'comment', 'share', 'follow'), 50),
+    ('media', 'verification_status', 'media_verification_status',
+     ('UNVERIFIED', 'VERIFIED', 'VERIFIED_SIGNATURE_ONLY', 'VERIFIED_WITH_HARDWARE_ATTESTATION'), None),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The default has to be dropped while the column changes type
+    op.alter_column('media', 'verification_status', server_default=None)
+    for table, column, type_name, labels, _ in ENUM_COLUMNS:
+        enum_type = postgresql.ENUM(*labels, name=type_name)
+        enum_type.create(op.get_bind(), checkfirst=True)
+        op.alter_column(table, column, type_=enum_type, postgresql_using=f'{column}::{type_name}')
+    op.alter_column('media', 'verification_status', server_default='UNVERIFIED')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('media', 'verification_status', server_default=None)
+    for table, column, type_name, _, length in ENUM_COLUMNS:
+        op.alter_column(table, column, type_=sa.String(length=length), postgresql_using=f'{column}::text')
+        postgresql.ENUM(name=type_name).drop(op.get_bind(), checkfirst=True)
+    op.alter_column('media', 'verification_status', server_default='UNVERIFIED')
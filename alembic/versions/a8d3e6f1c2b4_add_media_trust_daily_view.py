@@ -0,0 +1,42 @@
+"""Add media_trust_daily materialized view
+
+Revision ID: a8d3e6f1c2b4
+Revises: f1a7c4e2b9d3
+Create Date: 2026-10-16 13:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3e6f1c2b4'
+down_revision: Union[str, Sequence[str], None] = 'f1a7c4e2b9d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Daily trust score rollup per 0.1 degree grid cell, refreshed by the app
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS media_trust_daily AS
+        SELECT date_trunc('day', capture_time) AS day,
+               ST_SnapToGrid(location::geometry, 0.1) AS cell,
+               count(*) AS n,
+               avg(trust_score) AS avg_trust
+        FROM media
+        WHERE capture_time IS NOT NULL AND location IS NOT NULL
+        GROUP BY 1, 2;
+        """
+    )
+    # REFRESH ... CONCURRENTLY requires a unique index covering every row
+    op.execute('CREATE UNIQUE INDEX IF NOT EXISTS media_trust_daily_day_cell_key ON media_trust_daily (day, cell);')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS media_trust_daily;')
@@ -0,0 +1,100 @@
+"""Add interaction_rollup table maintained by a trigger on user_interactions
+
+Revision ID: b6f2d9a4e1c7
+Revises: a8d3e6f1c2b4
+Create Date: 2026-10-16 13:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f2d9a4e1c7'
+down_revision: Union[str, Sequence[str], None] = 'a8d3e6f1c2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Counts one interaction row into its (claim_id, UTC day) bucket, with
+# sign -1 taking it back out; rows not on a claim are ignored
+APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION interaction_rollup_apply(r user_interactions, sign integer)
+RETURNS void AS $$
+BEGIN
+    IF r.claim_id IS NULL THEN
+        RETURN;
+    END IF;
+    INSERT INTO interaction_rollup AS ir (claim_id, day, upvotes, downvotes, shares)
+    VALUES (
+        r.claim_id,
+        (coalesce(r.created_at, now()) AT TIME ZONE 'UTC')::date,
+        sign * coalesce(r.interaction_type = 'vote' AND r.value > 0, false)::int,
+        sign * coalesce(r.interaction_type = 'vote' AND r.value < 0, false)::int,
+        sign * (r.interaction_type = 'share')::int
+    )
+    ON CONFLICT (claim_id, day) DO UPDATE SET
+        upvotes = ir.upvotes + EXCLUDED.upvotes,
+        downvotes = ir.downvotes + EXCLUDED.downvotes,
+        shares = ir.shares + EXCLUDED.shares;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION interaction_rollup_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM interaction_rollup_apply(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM interaction_rollup_apply(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('interaction_rollup',
+    sa.Column('claim_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('upvotes', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('downvotes', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('shares', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['claim_id'], ['claims.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('claim_id', 'day')
+    )
+    op.execute(APPLY_FUNCTION)
+    op.execute(TRIGGER_FUNCTION)
+    op.execute(
+        'CREATE TRIGGER user_interactions_rollup '
+        'AFTER INSERT OR UPDATE OR DELETE ON user_interactions '
+        'FOR EACH ROW EXECUTE FUNCTION interaction_rollup_trigger();'
+    )
+    # Backfill from the interactions recorded so far
+    op.execute(
+        """
+        INSERT INTO interaction_rollup (claim_id, day, upvotes, downvotes, shares)
+        SELECT claim_id,
+               (coalesce(created_at, now()) AT TIME ZONE 'UTC')::date,
+               count(*) FILTER (WHERE interaction_type = 'vote' AND value > 0),
+               count(*) FILTER (WHERE interaction_type = 'vote' AND value < 0),
+               count(*) FILTER (WHERE interaction_type = 'share')
+        FROM user_interactions
+        WHERE claim_id IS NOT NULL
+        GROUP BY 1, 2;
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS user_interactions_rollup ON user_interactions;')
+    op.execute('DROP FUNCTION IF EXISTS interaction_rollup_trigger();')
+    op.execute('DROP FUNCTION IF EXISTS interaction_rollup_apply(user_interactions, integer);')
+    op.drop_table('interaction_rollup')
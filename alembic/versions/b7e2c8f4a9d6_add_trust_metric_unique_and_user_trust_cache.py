@@ -0,0 +1,98 @@
+"""Make trust_metrics unique per dimension and add trigger-maintained user_trust_cache
+
+Revision ID: b7e2c8f4a9d6
+Revises: a3f9c6e2d8b1
+Create Date: 2026-10-16 17:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c8f4a9d6'
+down_revision: Union[str, Sequence[str], None] = 'a3f9c6e2d8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Weight-averaged score of a user's user_trust metrics
+USER_TRUST_SELECT = """
+    SELECT user_id, sum(trust_score * weight) / nullif(sum(weight), 0)
+    FROM trust_metrics
+    WHERE metric_type = 'user_trust' AND trust_score IS NOT NULL AND weight IS NOT NULL
+"""
+
+TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION user_trust_cache_trigger() RETURNS trigger AS $$
+DECLARE
+    affected integer;
+BEGIN
+    FOREACH affected IN ARRAY ARRAY[
+        CASE WHEN TG_OP <> 'INSERT' THEN OLD.user_id END,
+        CASE WHEN TG_OP <> 'DELETE' THEN NEW.user_id END
+    ] LOOP
+        CONTINUE WHEN affected IS NULL;
+        INSERT INTO user_trust_cache (user_id, trust_score, updated_at)
+        VALUES (
+            affected,
+            (SELECT sum(trust_score * weight) / nullif(sum(weight), 0)
+             FROM trust_metrics
+             WHERE user_id = affected AND metric_type = 'user_trust'
+               AND trust_score IS NOT NULL AND weight IS NOT NULL),
+            now()
+        )
+        ON CONFLICT (user_id) DO UPDATE SET
+            trust_score = EXCLUDED.trust_score,
+            updated_at = EXCLUDED.updated_at;
+    END LOOP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep only the newest row of any duplicated dimension
+    op.execute(
+        """
+        DELETE FROM trust_metrics t
+        USING trust_metrics newer
+        WHERE newer.id > t.id
+          AND newer.user_id = t.user_id
+          AND newer.claim_id IS NOT DISTINCT FROM t.claim_id
+          AND newer.metric_type = t.metric_type
+          AND newer.context IS NOT DISTINCT FROM t.context;
+        """
+    )
+    op.create_unique_constraint(
+        'uq_trust_metric_dim', 'trust_metrics', ['user_id', 'claim_id', 'metric_type', 'context'],
+        postgresql_nulls_not_distinct=True
+    )
+
+    op.create_table('user_trust_cache',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('trust_score', sa.Float(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.execute(TRIGGER_FUNCTION)
+    op.execute(
+        'CREATE TRIGGER trust_metrics_user_trust_cache '
+        'AFTER INSERT OR UPDATE OR DELETE ON trust_metrics '
+        'FOR EACH ROW EXECUTE FUNCTION user_trust_cache_trigger();'
+    )
+    # Backfill from the metrics recorded so far
+    op.execute(f'INSERT INTO user_trust_cache (user_id, trust_score) {USER_TRUST_SELECT} GROUP BY user_id;')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS trust_metrics_user_trust_cache ON trust_metrics;')
+    op.execute('DROP FUNCTION IF EXISTS user_trust_cache_trigger();')
+    op.drop_table('user_trust_cache')
+    op.drop_constraint('uq_trust_metric_dim', 'trust_metrics', type_='unique')
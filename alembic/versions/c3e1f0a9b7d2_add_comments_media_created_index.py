@@ -0,0 +1,31 @@
+"""Add composite (media_id, created_at) index on comments
+
+Revision ID: c3e1f0a9b7d2
+Revises: 80f181c2d55c
+Create Date: 2026-10-16 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e1f0a9b7d2'
+down_revision: Union[str, Sequence[str], None] = '80f181c2d55c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_comments_media_id_created_at', 'comments', ['media_id', 'created_at'], unique=False)
+    # The composite index covers lookups by media_id on its own
+    op.drop_index(op.f('ix_comments_media_id'), table_name='comments')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_comments_media_id'), 'comments', ['media_id'], unique=False)
+    op.drop_index('ix_comments_media_id_created_at', table_name='comments')
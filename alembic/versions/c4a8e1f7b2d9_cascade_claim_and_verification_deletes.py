@@ -0,0 +1,45 @@
+"""Cascade claim and verification deletes in the database
+
+Revision ID: c4a8e1f7b2d9
+Revises: b7e2c8f4a9d6
+Create Date: 2026-10-16 17:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8e1f7b2d9'
+down_revision: Union[str, Sequence[str], None] = 'b7e2c8f4a9d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, referenced table); constraints carry PostgreSQL's default names
+CASCADED_FOREIGN_KEYS = (
+    ('verifications', 'claim_id', 'claims'),
+    ('verifications', 'user_id', 'users'),
+    ('claims', 'user_id', 'users'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, referred in CASCADED_FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred, [column], ['id'], ondelete='CASCADE')
+        # The cascade and the selectin loads look children up by this column
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, referred in CASCADED_FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred, [column], ['id'])
@@ -0,0 +1,34 @@
+"""Add covering (user_id, capture_time DESC, id DESC) index on media
+
+Revision ID: c9e4a7b2d5f8
+Revises: b6f2d9a4e1c7
+Create Date: 2026-10-16 14:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e4a7b2d5f8'
+down_revision: Union[str, Sequence[str], None] = 'b6f2d9a4e1c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A user's feed, newest first, read by an index-only scan
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_media_user_time '
+            'ON media (user_id, capture_time DESC, id DESC) INCLUDE (trust_score, file_path);'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_media_user_time;')
@@ -0,0 +1,41 @@
+"""Add storage_deletions outbox
+
+Revision ID: d2b8f5c1a6e9
+Revises: c9e4a7b2d5f8
+Create Date: 2026-10-16 14:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b8f5c1a6e9'
+down_revision: Union[str, Sequence[str], None] = 'c9e4a7b2d5f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('storage_deletions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('path', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('enqueued_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('done_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_storage_deletions_pending', 'storage_deletions', ['enqueued_at'],
+        unique=False, postgresql_where=sa.text('done_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_storage_deletions_pending', table_name='storage_deletions')
+    op.drop_table('storage_deletions')
@@ -0,0 +1,34 @@
+"""Add (provider, provider_id) index on users
+
+Revision ID: d4f2a1b8c6e3
+Revises: c3e1f0a9b7d2
+Create Date: 2026-10-16 10:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f2a1b8c6e3'
+down_revision: Union[str, Sequence[str], None] = 'c3e1f0a9b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction, and avoids blocking sign-ins while it builds
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS users_provider_providerid_idx '
+            'ON users (provider, provider_id);'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS users_provider_providerid_idx;')
@@ -0,0 +1,44 @@
+"""Add media upload status
+
+Revision ID: d8f3b6a1c9e4
+Revises: c4a8e1f7b2d9
+Create Date: 2026-10-16 19:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f3b6a1c9e4'
+down_revision: Union[str, Sequence[str], None] = 'c4a8e1f7b2d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+UPLOAD_STATUS_LABELS = ('pending', 'ready', 'failed')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    upload_status = postgresql.ENUM(*UPLOAD_STATUS_LABELS, name='media_upload_status')
+    upload_status.create(op.get_bind(), checkfirst=True)
+    # Every existing record already has its file in storage
+    op.add_column(
+        'media',
+        sa.Column(
+            'upload_status',
+            postgresql.ENUM(name='media_upload_status', create_type=False),
+            nullable=False,
+            server_default='ready'
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('media', 'upload_status')
+    postgresql.ENUM(name='media_upload_status').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,39 @@
+"""Make the users (provider, provider_id) index unique
+
+Revision ID: e5a3b2c9d7f4
+Revises: d4f2a1b8c6e3
+Create Date: 2026-10-16 11:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a3b2c9d7f4'
+down_revision: Union[str, Sequence[str], None] = 'd4f2a1b8c6e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Sign-in upserts with ON CONFLICT (provider, provider_id), which needs a unique index
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS users_provider_providerid_key '
+            'ON users (provider, provider_id);'
+        )
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS users_provider_providerid_idx;')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS users_provider_providerid_idx '
+            'ON users (provider, provider_id);'
+        )
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS users_provider_providerid_key;')
@@ -0,0 +1,44 @@
+"""Store media client hashes as raw bytea digests
+
+Revision ID: e7c1a9d4b3f6
+Revises: d2b8f5c1a6e9
+Create Date: 2026-10-16 15:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c1a9d4b3f6'
+down_revision: Union[str, Sequence[str], None] = 'd2b8f5c1a6e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+HASH_COLUMNS = ('client_media_hash', 'client_metadata_hash')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Hex text (64 chars) becomes the 32 raw bytes it encodes, in place
+    for column in HASH_COLUMNS:
+        op.alter_column(
+            'media', column,
+            type_=sa.LargeBinary(length=32),
+            postgresql_using=f"decode({column}, 'hex')"
+        )
+        op.create_check_constraint(f'ck_media_{column}_len', 'media', f'octet_length({column}) = 32')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in HASH_COLUMNS:
+        op.drop_constraint(f'ck_media_{column}_len', 'media', type_='check')
+        op.alter_column(
+            'media', column,
+            type_=sa.String(),
+            postgresql_using=f"encode({column}, 'hex')"
+        )
@@ -0,0 +1,34 @@
+"""Add (capture_time, id) index on media
+
+Revision ID: f1a7c4e2b9d3
+Revises: e5a3b2c9d7f4
+Create Date: 2026-10-16 12:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7c4e2b9d3'
+down_revision: Union[str, Sequence[str], None] = 'e5a3b2c9d7f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Scanned backwards for newest-first listing and (capture_time, id) keyset pages
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_media_capture_time '
+            'ON media (capture_time, id);'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_media_capture_time;')
@@ -0,0 +1,48 @@
+"""Use jsonb for JSON columns and GIN-index the searched ones
+
+Revision ID: f4d6b2e8a1c5
+Revises: e7c1a9d4b3f6
+Create Date: 2026-10-16 15:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4d6b2e8a1c5'
+down_revision: Union[str, Sequence[str], None] = 'e7c1a9d4b3f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+JSON_COLUMNS = (
+    ('users', 'social_links'),
+    ('verifications', 'tags'),
+    ('verifications', 'sources'),
+    ('user_interactions', 'metadata'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in JSON_COLUMNS:
+        op.alter_column(table, column, type_=postgresql.JSONB(), postgresql_using=f'"{column}"::jsonb')
+    op.create_index('idx_verifications_tags', 'verifications', ['tags'], postgresql_using='gin')
+    op.create_index('idx_verifications_sources', 'verifications', ['sources'], postgresql_using='gin')
+    op.create_index(
+        'idx_interactions_metadata', 'user_interactions', ['metadata'],
+        postgresql_using='gin', postgresql_ops={'metadata': 'jsonb_path_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_interactions_metadata', table_name='user_interactions')
+    op.drop_index('idx_verifications_sources', table_name='verifications')
+    op.drop_index('idx_verifications_tags', table_name='verifications')
+    for table, column in JSON_COLUMNS:
+        op.alter_column(table, column, type_=sa.JSON(), postgresql_using=f'"{column}"::json')
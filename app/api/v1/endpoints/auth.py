@@ -2,33 +2,53 @@ from fastapi.security import OAuth2PasswordBearer
 from typing import Annotated
 import logging
 from app.services.auth.apple_auth import verify_apple_id_token
-from app.services.auth.google_auth import GoogleAuth
+from app.services.auth.google_auth import get_google_auth
 from app.models.auth import SignInRequest, SignInResponse
 from app.services.user_service import UserService
-from app.security.jwt import create_access_token, create_refresh_token, decode_token, verify_refresh_token
-from app.db.session import get_db
-from sqlalchemy.orm import Session
+from app.security.jwt import create_access_token, create_refresh_token, decode_token, verify_refresh_token, revoke_refresh_token
+from app.db.session import get_async_db
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 import json
 from fastapi import Depends, HTTPException, Response, status, APIRouter
 from app.db.models import User
 from datetime import timedelta
-from typing import Dict
+from typing import Dict, Tuple
+import time
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Refresh tokens are trusted on their signature alone; the user row is only
+# re-read once per interval to pick up deactivated accounts.
+USER_RECHECK_INTERVAL_SECONDS = 15 * 60
+_USER_RECHECK_MAX_ENTRIES = 10_000
+_user_last_checked: Dict[Tuple[str, str], float] = {}
+
+def _needs_user_recheck(provider: str, user_id: str) -> bool:
+    """Return True if the user's active status should be re-read from the database."""
+    last_checked = _user_last_checked.get((provider, user_id))
+    return last_checked is None or time.monotonic() - last_checked > USER_RECHECK_INTERVAL_SECONDS
+
+def _mark_user_checked(provider: str, user_id: str) -> None:
+    """Record that the user's active status was just confirmed against the database."""
+    if len(_user_last_checked) >= _USER_RECHECK_MAX_ENTRIES:
+        _user_last_checked.clear()
+    _user_last_checked[(provider, user_id)] = time.monotonic()
+
 @router.post("/refresh-token", response_model=Dict[str, str])
 async def refresh_token(
-    refresh_token_body: Dict[str, str],
-    db: Session = Depends(get_db)
+    refresh_token_body: Dict[str, str]
 ):
     """
     Refresh an access token using a valid refresh token.
 
+    The signed token is trusted without a database lookup; the user's active
+    status is only re-checked every USER_RECHECK_INTERVAL_SECONDS.
+
     Args:
         refresh_token_body: Dictionary containing the refresh token
-        db: Database session
 
     Returns:
         Dictionary containing the new access token
@@ -60,17 +80,18 @@ async def refresh_token(
         
         logger.info(f'Refresh token request received for user: {user_id}')
         
-        # Check if user still exists and is active
-        user_service = UserService(db)
-        user = user_service.find_user_by_provider_id(provider, user_id)
-        user_service.close()
-
-        if not user or not user.is_active:
-            logger.warning(f"User not found or account inactive for refresh token request: {user_id}")
-            raise HTTPException(
-                status_code=403,
-                detail={"error": "REFRESH_TOKEN_INVALID"}
-            )
+        # Periodically check that the user still exists and is active
+        if _needs_user_recheck(provider, user_id):
+            async with UserService() as user_service:
+                user = await user_service.find_user_by_provider_id(provider, user_id)
+
+            if not user or not user.is_active:
+                logger.warning(f"User not found or account inactive for refresh token request: {user_id}")
+                raise HTTPException(
+                    status_code=403,
+                    detail={"error": "REFRESH_TOKEN_INVALID"}
+                )
+            _mark_user_checked(provider, user_id)
         
         # Generate new access token
         new_access_token = create_access_token(
@@ -93,10 +114,28 @@ async def refresh_token(
             detail="An unexpected error occurred during token refresh"
         )
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(refresh_token_body: Dict[str, str]):
+    """
+    Revoke a refresh token so it can no longer be used to obtain access tokens.
+
+    Args:
+        refresh_token_body: Dictionary containing the refresh token
+
+    Returns:
+        Empty 204 response. Unknown or already invalid tokens are ignored.
+    """
+    refresh_token_str = refresh_token_body.get("refreshToken")
+    token_payload = verify_refresh_token(refresh_token_str) if refresh_token_str else None
+    if token_payload:
+        revoke_refresh_token(token_payload.get("jti"), token_payload.get("exp"))
+        logger.info(f"Refresh token revoked on logout for user: {token_payload.get('userId')}")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
 @router.post("/signin", response_model=SignInResponse)
 async def signin(
     request: SignInRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Unified authentication endpoint for Apple and Google sign-in.
@@ -116,7 +155,7 @@ async def signin(
                 "name": claims.get("name", "")
             }
         elif request.provider == "google":
-            google_auth = GoogleAuth()
+            google_auth = get_google_auth()
             if request.token.startswith("eyJ"):
                 user_info = google_auth.verify_token(request.token)
             else:
@@ -127,20 +166,31 @@ async def signin(
         user_service = UserService(db)
 
         # --- 2. Try to find user by provider_id ---
-        user = user_service.find_user_by_provider_id(request.provider, user_info["provider_id"])
+        user = await user_service.find_user_by_provider_id(request.provider, user_info["provider_id"])
 
-        # --- 3. Handle user found by provider_id ---
+        # --- 3. Returning user: provider_id matched, so no further lookups are needed ---
         if user:
             if not user.is_active:
                 raise HTTPException(status_code=403, detail="DELETION_IN_PROGRESS")
 
-        # --- 4. No match by provider_id, check if email matches another account ---
+        # --- 4. Unknown provider_id — create the user in a single upsert ---
         else:
-            existing_user = None
-            if user_info.get("email"):
-                existing_user = user_service.find_user_by_email(user_info["email"])
+            username = user_info["email"].split("@")[0] if user_info.get("email") else None
+            user_data = {
+                "provider": request.provider,
+                "provider_id": user_info["provider_id"],
+                "email": user_info.get("email"),
+                "username": username,
+                "full_name": user_info.get("name") or None,
+            }
+            try:
+                user = await user_service.create_user(user_data)
+            except IntegrityError:
+                # --- 5. Email already belongs to an existing account ---
+                existing_user = await user_service.find_user_by_email(user_info.get("email"))
+                if not existing_user:
+                    raise
 
-            if existing_user:
                 if not existing_user.is_active:
                     raise HTTPException(status_code=403, detail="DELETION_IN_PROGRESS")
 
@@ -150,26 +200,17 @@ async def signin(
                         f"Provider ID mismatch detected for {request.provider}:{user_info['email']} "
                         f"— updating provider_id from {existing_user.provider_id} → {user_info['provider_id']}"
                     )
-                    existing_user.provider_id = user_info["provider_id"]
-                    db.commit()
-                    user = existing_user
+                    user = await user_service.update_provider_id(existing_user, user_info["provider_id"])
                 else:
                     # Email is used by another provider (real conflict)
                     raise HTTPException(status_code=403, detail="ACCOUNT_EXISTS")
-            else:
-                # --- 5. No existing email or provider match — create new user ---
-                username = user_info["email"].split("@")[0] if user_info.get("email") else None
-                user_data = {
-                    "provider": request.provider,
-                    "provider_id": user_info["provider_id"],
-                    "email": user_info.get("email"),
-                    "username": username,
-                    "full_name": user_info.get("name") or None,
-                }
-                user = user_service.create_user(user_data)
-
-        # --- 6. Create and return tokens ---
-        user_service.close()
+
+            if not user:
+                # Account for this provider ID was created concurrently and is inactive
+                raise HTTPException(status_code=403, detail="DELETION_IN_PROGRESS")
+
+        # --- 6. Commit any user writes in a single transaction, then create and return tokens ---
+        await user_service.commit()
         access_token = create_access_token(
             user_id=user.provider_id,
             provider=request.provider,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import Dict, Any, List
 import logging
 
@@ -13,17 +13,24 @@ router = APIRouter()
 # Use the standard logger
 logger = logging.getLogger(__name__)
 
+DEFAULT_COMMENTS_PAGE_SIZE = 50
+MAX_COMMENTS_PAGE_SIZE = 200
+
 @router.get("/comments/{media_id}", response_model=List[CommentResponse])
 def get_comments(
     media_id: str,
+    limit: int = Query(DEFAULT_COMMENTS_PAGE_SIZE, ge=1, le=MAX_COMMENTS_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
-    Retrieve all comments for a specific media item.
+    Retrieve a page of comments for a specific media item, newest first.
     
     Args:
         media_id: The ID of the media to retrieve comments for
+        limit: Maximum number of comments to return
+        offset: Number of comments to skip
         db: Database session
         current_user: Authenticated user context from JWT
         
@@ -36,7 +43,7 @@ def get_comments(
     logger.info(f"User {current_user['userId']} retrieving comments for media {media_id}")
     
     try:
-        comments = Comment.filter(db, media_id=media_id)
+        comments = Comment.list_for_media(db, media_id=media_id, limit=limit, offset=offset)
         logger.info(f"Found {len(comments)} comments for media {media_id}")
         return comments
     except Exception as e:
@@ -80,38 +87,34 @@ def create_comment(
             detail={"error": "INVALID_MEDIA_ID", "message": "Media ID cannot be empty"}
         )
         
-    # Check if media exists in database
-    from app.db.models.media import Media
-    media = db.query(Media).filter(Media.id == media_id).first()
-    if not media:
-        logger.warning(f"Media not found for media_id: {media_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={"error": "MEDIA_NOT_FOUND", "message": f"Media with id {media_id} not found"}
-        )
-        
     try:
-        # Create the comment in database
-        comment = Comment.create(
+        # Create the comment, checking the media exists in the same statement
+        comment = Comment.create_for_media(
             session=db,
             media_id=media_id,
             text=comment_data.text,
             user_id=current_user['userId']
         )
-        
-        logger.info(f"Successfully created comment {comment.id} for media {media_id} by user {current_user['userId']}")
-        
-        return {
-            "id": comment.id,
-            "media_id": comment.media_id,
-            "text": comment.text,
-            "user_id": comment.user_id,
-            "created_at": comment.created_at
-        }
-        
     except Exception as e:
         logger.error(f"Failed to create comment for media {media_id}: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={"error": "COMMENT_CREATION_FAILED", "message": "Failed to create comment"}
         )
+
+    if not comment:
+        logger.warning(f"Media not found for media_id: {media_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": "MEDIA_NOT_FOUND", "message": f"Media with id {media_id} not found"}
+        )
+
+    logger.info(f"Successfully created comment {comment.id} for media {media_id} by user {current_user['userId']}")
+    
+    return {
+        "id": comment.id,
+        "media_id": comment.media_id,
+        "text": comment.text,
+        "user_id": comment.user_id,
+        "created_at": comment.created_at
+    }
@@ -1,17 +1,20 @@
-import cv2
-import numpy as np
+import asyncio
+import subprocess
 import tempfile
+import threading
 
-from fastapi import APIRouter, Depends, Form, File, UploadFile, HTTPException, status
-from fastapi.responses import JSONResponse, Response
+from fastapi import APIRouter, BackgroundTasks, Depends, Form, File, UploadFile, HTTPException, status
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
 import logging
 import os
 
+from cachetools import TTLCache
+import orjson
 from pydantic import ValidationError
 import ffmpeg
-from geoalchemy2.shape import to_shape
 import uuid
 
 from app.middleware.auth import get_current_user
@@ -19,165 +22,347 @@ from app.core.logging import logger
 from app.models.media import MediaMetadata
 from app.services.storage import save_file, delete_file
 from app.db.models.media import Media
-from app.schemas.media import MediaFilterParams, MediaListResponse, Media as MediaSchema
-from app.db.session import SessionLocal, get_db, Session
+from app.db.models.enums import MediaUploadStatus
+from app.schemas.media import MediaDetail, MediaFilterParams, MediaListResponse, Media as MediaSchema
+from app.db.session import get_db, Session
 from app.services.trust import calculate_trust_score
 from app.core.config import settings
-from app.services.verification import verify_signature
+from app.services.verification import CHUNK_SIZE_BYTES, MediaHasher, verify_signature
 
 router = APIRouter()
 
-def reencode_video_for_web_compatibility(video_data: bytes) -> bytes:
+# Accepted upload content types, limited to those with a known file
+# extension to store them under
+CONTENT_TYPE_EXT = {"image/jpeg": ".jpg", "video/mp4": ".mp4"}
+ALLOWED_TYPES = settings.ALLOWED_CONTENT_TYPES.intersection(CONTENT_TYPE_EXT)
+
+# Stored media paths are the object key prefixed with the bucket name
+OBJECT_KEY_PREFIX = f"{settings.S3_BUCKET_NAME}/"
+
+# Serialized GET /media responses, keyed on the (snapped) query. Map pans
+# tend to repeat near-identical queries, so coordinates are snapped to 4
+# decimal places (~11 m) and the query runs on the snapped centre, keeping
+# each cached payload exact for its key. Cleared whenever an upload becomes
+# ready or media is deleted in this process; other worker processes keep
+# their own copy, so they can serve results up to the TTL stale. TTLCache
+# isn't thread-safe and is shared by the event loop and threadpool, so every
+# access holds the lock.
+MEDIA_QUERY_CACHE_TTL_SECONDS = 60
+MEDIA_QUERY_CACHE_MAXSIZE = 1024
+MEDIA_QUERY_COORD_PRECISION = 4
+# Larger responses are streamed without being cached, keeping memory flat
+MEDIA_QUERY_CACHE_MAX_BYTES = 1024 * 1024
+_media_query_cache: TTLCache = TTLCache(maxsize=MEDIA_QUERY_CACHE_MAXSIZE, ttl=MEDIA_QUERY_CACHE_TTL_SECONDS)
+_media_query_cache_lock = threading.Lock()
+
+# FFmpeg output options for web-compatible MP4 (H.264 video, AAC audio),
+# encoded on the GPU with NVENC or on the CPU with libx264. The output is
+# written to a pipe, so it is a fragmented MP4: unlike +faststart, the
+# frag_keyframe/empty_moov layout needs no seeking and still streams on the web
+NVENC_OUTPUT_OPTIONS = {
+    'c:v': 'h264_nvenc',     # Video codec: H.264 on the NVIDIA encoder
+    'preset': 'p4',          # Balanced NVENC speed/quality preset
+    'tune': 'll',            # Low-latency tuning
+    'rc': 'vbr',
+    'cq': 23,
+    'profile:v': 'main',     # H.264 profile for broad compatibility
+    'pix_fmt': 'yuv420p',    # Standard pixel format for web video
+    'c:a': 'aac',            # Audio codec: AAC (the web standard)
+    'f': 'mp4',              # Container must be explicit when writing to a pipe
+    'movflags': '+frag_keyframe+empty_moov+default_base_moof'  # Streamable without seeking
+}
+X264_OUTPUT_OPTIONS = {
+    'c:v': 'libx264',        # Video codec: H.264 (highly compatible)
+    'preset': 'ultrafast',   # Fastest CPU preset
+    'profile:v': 'main',
+    'pix_fmt': 'yuv420p',
+    'c:a': 'aac',
+    'f': 'mp4',
+    'movflags': '+frag_keyframe+empty_moov+default_base_moof'
+}
+
+# The thumbnail is the first (autorotated) frame, at most 640px wide
+THUMBNAIL_MAX_WIDTH = 640
+THUMBNAIL_OUTPUT_OPTIONS = {
+    'vframes': 1,
+    'f': 'image2',
+    'c:v': 'mjpeg',
+    'q:v': 3
+}
+
+# FFmpeg already uses every core for a single encode, so running more than
+# a couple at once only adds contention. Encodes beyond this wait their turn.
+MAX_CONCURRENT_VIDEO_ENCODES = 2
+_video_encode_slots = threading.BoundedSemaphore(MAX_CONCURRENT_VIDEO_ENCODES)
+
+# Input options decoding on the GPU with NVDEC. Decoded frames are copied
+# back to system memory: autorotation and the thumbnail scale run on the CPU
+CUDA_INPUT_OPTIONS = {'hwaccel': 'cuda'}
+
+def _ffmpeg_lists(flag: str, name: str) -> bool:
+    """Return whether ``ffmpeg <flag>`` (e.g. -encoders) lists ``name``."""
+    try:
+        output = subprocess.run(
+            ["ffmpeg", "-hide_banner", flag],
+            capture_output=True, text=True, timeout=10, check=True
+        ).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Could not run ffmpeg {flag}: {e}")
+        return False
+    return name in output.split()
+
+@lru_cache(maxsize=1)
+def nvenc_available() -> bool:
+    """
+    Return whether videos should be encoded with h264_nvenc.
+
+    Uses settings.USE_NVENC when set, otherwise checks once whether the
+    installed FFmpeg build lists the h264_nvenc encoder.
+    """
+    if settings.USE_NVENC is not None:
+        return settings.USE_NVENC
+    available = _ffmpeg_lists("-encoders", "h264_nvenc")
+    logger.info(f"Video encoder: {'h264_nvenc' if available else 'libx264'}")
+    return available
+
+@lru_cache(maxsize=1)
+def cuda_hwaccel_available() -> bool:
+    """
+    Return whether NVENC encodes should also decode on the GPU.
+
+    Uses settings.USE_CUDA_HWACCEL when set, otherwise checks once whether
+    the installed FFmpeg build lists the cuda hwaccel.
+    """
+    if settings.USE_CUDA_HWACCEL is not None:
+        return settings.USE_CUDA_HWACCEL
+    available = _ffmpeg_lists("-hwaccels", "cuda")
+    logger.info(f"Video decoding: {'cuda' if available else 'cpu'}")
+    return available
+
+def _run_reencode(
+    input_path: str,
+    thumbnail_path: str,
+    output_options: dict,
+    filename: str,
+    input_options: Optional[dict] = None
+) -> None:
     """
-    Re-encodes a video to a web-compatible MP4 format (H.264 video, AAC audio).
+    Run FFmpeg once to re-encode ``input_path`` and write its thumbnail.
 
-    This function takes raw video data, writes it to a temporary file,
-    and then uses FFmpeg to process it. It corrects potential issues like
+    The input is decoded a single time and feeds both outputs: the encoded
+    video, streamed from FFmpeg's stdout to storage under ``filename`` as it
+    is produced, and a JPEG of the first frame written to ``thumbnail_path``.
+
+    Raises:
+        ffmpeg.Error: If FFmpeg exits with an error. The stored object may
+            then be truncated and must not be used.
+    """
+    inp = ffmpeg.input(input_path, **(input_options or {}))
+    video = ffmpeg.output(inp['v'], inp['a?'], 'pipe:1', **output_options)
+    thumbnail = (
+        inp['v']
+        .filter('scale', f'min({THUMBNAIL_MAX_WIDTH},iw)', -2, flags='lanczos')
+        .output(thumbnail_path, **THUMBNAIL_OUTPUT_OPTIONS)
+    )
+    args = ffmpeg.merge_outputs(video, thumbnail).global_args('-nostats').compile(overwrite_output=True)
+
+    # stderr goes to a file so a chatty FFmpeg can never block on a full pipe
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=stderr)
+        try:
+            save_file(process.stdout, filename, "video/mp4")
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+        if returncode != 0:
+            stderr.seek(0)
+            raise ffmpeg.Error('ffmpeg', b'', stderr.read())
+
+def reencode_video_for_web_compatibility(input_path: str, filename: str) -> Optional[bytes]:
+    """
+    Re-encodes a video to a web-compatible MP4 format (H.264 video, AAC audio),
+    streaming it to storage, and extracts its thumbnail in the same FFmpeg pass.
+
+    This function uses FFmpeg to process the video, read from a file since
+    MP4 input may need seeking (e.g. when the moov atom is at the end),
+    encoding with h264_nvenc when an NVIDIA
+    GPU is available and libx264 otherwise. The encoded video is uploaded
+    from FFmpeg's stdout in multipart chunks while encoding is in progress,
+    so it is never held in memory in full. It corrects potential issues like
     unsupported audio codecs (e.g., AMR) and non-standard video settings.
 
+    The thumbnail is a JPEG of the first frame, scaled to at most 640px wide
+    without cropping. FFmpeg autorotates frames from their display matrix,
+    so the thumbnail matches the video's intended orientation.
+
     Args:
-        video_data: The raw byte content of the video file.
+        input_path: The path of the uploaded video.
+        filename: The object key to store the re-encoded video under.
 
     Returns:
-        The raw byte content of the re-encoded video file.
+        The JPEG thumbnail, or None if no thumbnail could be produced.
 
     Raises:
-        ffmpeg.Error: If the FFmpeg process fails.
-        Exception: For other file I/O errors.
+        ffmpeg.Error: If the FFmpeg process fails. Nothing is left stored.
+        Exception: For other file I/O or storage errors.
     """
-    input_temp_file = None
-    output_temp_file = None
+    thumbnail_temp_file = None
     try:
-        # Create a temporary file for the input video data
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as temp_in:
-            temp_in.write(video_data)
-            input_temp_file = temp_in.name
-
-        # Create a temporary file path for the output
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as temp_out:
-            output_temp_file = temp_out.name
-
-        logger.info(f"Starting re-encoding from {input_temp_file} to {output_temp_file}")
-
-        # Build and run the FFmpeg command
-        (
-            ffmpeg
-            .input(input_temp_file)
-            .output(
-                output_temp_file,
-                **{
-                    'c:v': 'libx264',        # Video codec: H.264 (highly compatible)
-                    'profile:v': 'main',     # H.264 profile for broad compatibility
-                    'pix_fmt': 'yuv420p',    # Standard pixel format for web video
-                    'c:a': 'aac',            # Audio codec: AAC (the web standard)
-                    'movflags': '+faststart' # Optimize for web streaming
-                }
-            )
-            .run(capture_stdout=True, capture_stderr=True, overwrite_output=True)
-        )
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_thumb:
+            thumbnail_temp_file = temp_thumb.name
+
+        logger.info(f"Starting re-encoding of {input_path}")
+
+        # Encode (and decode) on the GPU when available, falling back to the CPU if NVENC
+        # fails (e.g. no free encoder session or an unsupported input). The
+        # retry overwrites whatever the failed run stored.
+        with _video_encode_slots:
+            if nvenc_available():
+                input_options = CUDA_INPUT_OPTIONS if cuda_hwaccel_available() else None
+                try:
+                    _run_reencode(input_path, thumbnail_temp_file, NVENC_OUTPUT_OPTIONS, filename, input_options)
+                except ffmpeg.Error as e:
+                    logger.warning(f"NVENC re-encoding failed, retrying with libx264: {e.stderr.decode('utf8')}")
+                    _run_reencode(input_path, thumbnail_temp_file, X264_OUTPUT_OPTIONS, filename)
+            else:
+                _run_reencode(input_path, thumbnail_temp_file, X264_OUTPUT_OPTIONS, filename)
         
         logger.info("FFmpeg re-encoding successful.")
 
-        # Read the re-encoded data from the output file
-        with open(output_temp_file, 'rb') as f:
-            reencoded_data = f.read()
-        
-        return reencoded_data
+        with open(thumbnail_temp_file, 'rb') as f:
+            return f.read() or None
 
     except ffmpeg.Error as e:
         logger.error("FFmpeg re-encoding failed.")
         # The stderr from FFmpeg is very useful for debugging
-        logger.error(f"FFmpeg stdout: {e.stdout.decode('utf8')}")
         logger.error(f"FFmpeg stderr: {e.stderr.decode('utf8')}")
+        # Don't leave a truncated video behind in storage
+        delete_file(filename)
         raise  # Re-raise the exception to be handled by the endpoint
     finally:
         # --- Crucial Cleanup Step ---
-        # Ensure temporary files are deleted regardless of success or failure
-        if input_temp_file and os.path.exists(input_temp_file):
-            os.unlink(input_temp_file)
-            logger.debug(f"Cleaned up temp input file: {input_temp_file}")
-        if output_temp_file and os.path.exists(output_temp_file):
-            os.unlink(output_temp_file)
-            logger.debug(f"Cleaned up temp output file: {output_temp_file}")
-
-def generate_video_thumbnail(video_data: bytes, max_width: int = 640) -> Optional[bytes]:
+        # Ensure the thumbnail temp file is deleted regardless of success or failure
+        if thumbnail_temp_file and os.path.exists(thumbnail_temp_file):
+            os.unlink(thumbnail_temp_file)
+            logger.debug("Cleaned up temp file: %s", thumbnail_temp_file)
+
+def _spool_upload_to_temp_file(upload_file: BinaryIO, suffix: str, content_type: str) -> Tuple[str, bytes]:
     """
-    Generates a JPEG thumbnail from the first frame of a video, preserving its
-    correct orientation and aspect ratio.
+    Copy an upload to a temporary file in fixed-size chunks, hashing it on the way.
+
+    The upload is read only once: the same chunks feed the media hash used
+    for signature verification. The copy outlives the request, so storage
+    can be written after the response is sent.
 
-    This function is rotation-aware, using ffprobe to detect rotation metadata
-    from mobile devices. It then rotates the frame and resizes it proportionally
-    without cropping, ensuring the thumbnail matches the video's intended view.
+    Returns:
+        The path of the copy and the server-side media hash.
+    """
+    hasher = MediaHasher(content_type)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+        try:
+            while True:
+                chunk = upload_file.read(CHUNK_SIZE_BYTES)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                temp_file.write(chunk)
+        except Exception:
+            os.unlink(temp_file.name)
+            raise
+    return temp_file.name, hasher.digest()
+
+class ProcessedUpload(NamedTuple):
+    """Outcome of storing an upload for its pending media record."""
+    thumbnail_key: Optional[str]
+
+def _process_video(upload_path: str, base_name: str, filename: str) -> ProcessedUpload:
+    """
+    Re-encode a video upload, streaming it to storage, and store its thumbnail.
+
+    The upload copy is removed once encoding has finished.
     """
-    temp_video_path = None
-    cap = None
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as temp_video_file:
-            temp_video_file.write(video_data)
-            temp_video_path = temp_video_file.name
+        logger.info(f"Re-encoding video {filename} for web compatibility...")
+        thumbnail_data = reencode_video_for_web_compatibility(upload_path, filename)
+        logger.info(f"Video successfully re-encoded and saved with key: {OBJECT_KEY_PREFIX}{filename}")
+    except Exception as e:
+        # If encoding fails, we should not proceed with the potentially broken file.
+        logger.error(f"Critical error during video re-encoding for {filename}: {e}", exc_info=True)
+        raise
+    finally:
+        os.unlink(upload_path)
 
-        rotation = 0
-        try:
-            probe = ffmpeg.probe(temp_video_path)
-            video_stream = next((s for s in probe['streams'] if s['codec_type'] == 'video'), None)
-            
-            if video_stream and 'side_data_list' in video_stream:
-                for side_data in video_stream['side_data_list']:
-                    if side_data.get('side_data_type') == 'Display Matrix':
-                        if 'rotation' in side_data:
-                            rotation = int(side_data['rotation'])
-                            logger.info(f"Found rotation '{rotation}' in Display Matrix.")
-                            break
-            
-            if rotation == 0 and video_stream and 'tags' in video_stream:
-                if 'rotate' in video_stream['tags']:
-                    rotation = int(video_stream['tags']['rotate'])
-                    logger.info(f"Found rotation '{rotation}' in stream tags (fallback).")
-        except Exception as e:
-            logger.warning(f"Could not determine video rotation. Error: {e}")
-
-        cap = cv2.VideoCapture(temp_video_path)
-        if not cap.isOpened():
-            logger.error("Could not open video file for thumbnail generation.")
-            return None
-
-        success, frame = cap.read()
-        if not success:
-            logger.error("Could not read frame from video for thumbnail generation.")
-            return None
-
-        # --- Apply detected rotation ---
-        if rotation == 90:
-            frame = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
-        elif rotation == 180:
-            frame = cv2.rotate(frame, cv2.ROTATE_180)
-        elif rotation == 270 or rotation == -90:
-            frame = cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
-
-        h, w, _ = frame.shape
-        aspect_ratio = h / w
-        new_height = int(max_width * aspect_ratio)
-
-        resized_frame = cv2.resize(frame, (max_width, new_height), interpolation=cv2.INTER_AREA)
-
-        success, buffer = cv2.imencode('.jpg', resized_frame)
-        if not success:
-            logger.error("Failed to encode frame to JPEG for thumbnail.")
-            return None
-            
-        return buffer.tobytes()
+    if not thumbnail_data:
+        logger.warning("Failed to generate thumbnail, proceeding without one.")
+        return ProcessedUpload(thumbnail_key=None)
 
+    thumbnail_filename = f"{base_name}_thumb.jpg"
+    try:
+        save_file(thumbnail_data, thumbnail_filename, "image/jpeg")
     except Exception as e:
-        logger.error(f"Error during thumbnail generation: {e}", exc_info=True)
-        return None
+        # The video itself is stored, so a missing thumbnail shouldn't fail the upload
+        logger.warning(f"Failed to save thumbnail {thumbnail_filename}, proceeding without one: {e}")
+        return ProcessedUpload(thumbnail_key=None)
+    thumbnail_key = OBJECT_KEY_PREFIX + thumbnail_filename
+    logger.info(f"Thumbnail saved with key: {thumbnail_key}")
+    return ProcessedUpload(thumbnail_key=thumbnail_key)
+
+def _process_image(upload_path: str, base_name: str, filename: str) -> ProcessedUpload:
+    """
+    Store an image upload as is.
+
+    The upload copy is removed once it has been stored.
+    """
+    try:
+        with open(upload_path, "rb") as f:
+            save_file(f, filename, "image/jpeg")
     finally:
-        if cap is not None:
-            cap.release()
-        if temp_video_path and os.path.exists(temp_video_path):
-            os.unlink(temp_video_path)
+        os.unlink(upload_path)
+    logger.info(f"File saved with key: {OBJECT_KEY_PREFIX}{filename}")
+    return ProcessedUpload(thumbnail_key=None)
+
+# Per content type processing, run by _persist_upload once the response has been sent
+UPLOAD_PROCESSORS: Dict[str, Callable[[str, str, str], ProcessedUpload]] = {
+    "image/jpeg": _process_image,
+    "video/mp4": _process_video,
+}
+
+def _persist_upload(
+    upload_path: str, base_name: str, filename: str, content_type: str, media_id: str, db: Session
+) -> None:
+    """
+    Store an accepted upload once the response has been sent, and record the
+    outcome on its pending media record.
+
+    The record is marked ready (with its thumbnail, if any) once the file is
+    stored, or failed if storing it fails, so the client polling it learns
+    either way. It is never deleted here.
+
+    Args:
+        upload_path: The path of a temporary copy of the upload, which the
+            processor removes.
+        base_name: The object key stem, shared with the video thumbnail.
+        filename: The object key to store the file under.
+        content_type: The MIME type of the file.
+        media_id: The pending media record pointing at the file.
+        db: The request's session; DBSessionMiddleware removes it once this
+            task finishes.
+    """
+    try:
+        processed = UPLOAD_PROCESSORS[content_type](upload_path, base_name, filename)
+    except Exception as e:
+        logger.error(f"Failed to store upload for media {media_id}: {str(e)}", exc_info=True)
+        Media.finish_upload(db, media_id, MediaUploadStatus.FAILED)
+        return
+
+    Media.finish_upload(db, media_id, MediaUploadStatus.READY, thumbnail_path=processed.thumbnail_key)
+    with _media_query_cache_lock:
+        _media_query_cache.clear()
+    logger.info(f"Media upload stored: media_id={media_id}")
 
 @router.post("/media")
 async def create_media(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="The media file to upload"),
     metadata_str: str = Form(..., alias="metadata", description="A JSON string of the media metadata"),
     current_user = Depends(get_current_user),
@@ -190,15 +375,22 @@ async def create_media(
 ):
     """
     Upload a new media file with metadata.
+
+    The upload is verified and a pending media record is created before
+    responding with 202 Accepted. The file is stored afterwards in a
+    background task (videos are re-encoded on the way), which marks the
+    record ready or failed; clients poll GET /media/{id} for the outcome.
+    Only ready media is listed by GET /media.
     """
     # Extract user_id from current_user
-    logger.debug(current_user)
+    # Formatted lazily: only stringified when debug logging is enabled
+    logger.debug("Current user: %s", current_user)
     user_id = current_user.get("userId")
     
     # Log the upload attempt
     logger.info(f"User {user_id} attempting signed media upload for {file.filename}")
     try:
-        metadata = MediaMetadata.parse_raw(metadata_str)
+        metadata = MediaMetadata.model_validate_json(metadata_str)
     except ValidationError as e:
         # If the JSON is malformed or missing fields, raise a 422
         raise HTTPException(
@@ -207,38 +399,21 @@ async def create_media(
         )
     
     # Validate content type
-    if file.content_type not in ["image/jpeg", "video/mp4"]:
+    if file.content_type not in ALLOWED_TYPES:
         logger.error(f"Invalid file type: {file.content_type}")
         raise HTTPException(
             status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
             detail="Unsupported media type. Only JPEG images and MP4 videos are allowed."
         )
     
-    # Validate file size
-    try:
-        # Move to end of file to get size
-        file.file.seek(0, 2)
-        file_size = file.file.tell()
-        
-        # Reset file pointer to beginning
-        file.file.seek(0)
-    
-        max_size = 104_857_600  # 100MB
-        if file_size > max_size:
-            logger.error(f"File too large: {file_size} bytes")
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File too large: {file_size} bytes. Maximum allowed is {max_size} bytes."
-            )
-    except Exception as e:
-        logger.error(f"Error reading file size: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Error processing file"
-        )
+    # Copy the upload to disk once, computing its hash on the way
+    await file.seek(0)
+    upload_path, server_media_hash = await asyncio.to_thread(
+        _spool_upload_to_temp_file, file.file, CONTENT_TYPE_EXT[file.content_type], file.content_type
+    )
 
     verification_result = await verify_signature(
-        file=file,
+        server_media_hash=server_media_hash,
         metadata_str=metadata_str,
         client_media_hash_hex=media_hash,
         client_metadata_hash_hex=metadata_hash,
@@ -249,73 +424,22 @@ async def create_media(
 
     if not verification_result.is_valid:
         logger.warning(f"Verification failed for {file.filename}: {verification_result.status_message}")
+        os.unlink(upload_path)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Verification failed: {verification_result.status_message}")
 
-    try:
-        metadata = MediaMetadata.parse_raw(metadata_str)
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid metadata format.")
-
     # Set upload time to current UTC time
     upload_time = datetime.now(timezone.utc)
     trust_score = calculate_trust_score(metadata.capture_time, upload_time)
     
     # Generate a unique filename
-    base_uuid = uuid.uuid4()
-    _, file_extension = os.path.splitext(file.filename)
-    unique_filename = f"{base_uuid}{file_extension}"
-
-    thumbnail_key = None
+    base_name = uuid.uuid4().hex
+    unique_filename = base_name + CONTENT_TYPE_EXT[file.content_type]
+    object_key = OBJECT_KEY_PREFIX + unique_filename
 
     try:
-        # Read file data
-        file_data = await file.read()
-
-        if file.content_type == "video/mp4":
-
-            try:
-                logger.info(f"Re-encoding video {unique_filename} for web compatibility...")
-                reencoded_file_data = reencode_video_for_web_compatibility(file_data)
-                
-                # If encoding is successful, replace the original file data
-                file_data = reencoded_file_data
-                logger.info("Video successfully re-encoded. New size: {len(file_data)} bytes.")
-
-            except Exception as e:
-                # If encoding fails, we should not proceed with the potentially broken file.
-                logger.error(f"Critical error during video re-encoding for {unique_filename}: {e}", exc_info=True)
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
-                    detail="Failed to process video file. It may be corrupted or in an unsupported format."
-                )
-
-            logger.info(f"Generating thumbnail for video {unique_filename}...")
-            thumbnail_data = generate_video_thumbnail(file_data)
-            if thumbnail_data:
-                thumbnail_filename = f"{base_uuid}_thumb.jpg"
-                save_file(thumbnail_data, thumbnail_filename, "image/jpeg")
-                thumbnail_key = f"{settings.S3_BUCKET_NAME}/{thumbnail_filename}"
-                logger.info(f"Thumbnail saved with key: {thumbnail_key}")
-            else:
-                logger.warning("Failed to generate thumbnail, proceeding without one.")
-
-        # Save the main file to S3
-        object_key = f"{settings.S3_BUCKET_NAME}/{unique_filename}"
-        save_file(file_data, unique_filename, file.content_type)
-        logger.info(f"File saved with key: {object_key}")
-        
-    except Exception as e:
-        logger.error(f"Failed to save file: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to save file"
-        )
-    
-    # Create database session
-    db = SessionLocal()
-    try:
-        # Create media record in database
-        media = Media.create(
+        # Create a pending media record in database, off the event loop
+        media = await asyncio.to_thread(
+            Media.create,
             db=db,
             capture_time=metadata.capture_time,
             lat=metadata.lat,
@@ -326,52 +450,95 @@ async def create_media(
             trust_score=trust_score,
             user_id=user_id,
             file_path=object_key,
-            thumbnail_path=thumbnail_key,
             verification_status=verification_result.status_message,
             signature=signature,
             public_key=public_key,
-            client_media_hash=media_hash,
-            client_metadata_hash=metadata_hash
-        )
-        # Log successful creation
-        logger.info(f"Media record created with ID {media.id}")
-        
-        location_point = to_shape(media.location)
-
-        # Construct response data
-        response_data = {
-            "id": media.id,
-            "capture_time": media.capture_time.isoformat(),
-            "lat": location_point.y,
-            "lng": location_point.x,
-            "orientation": {
-                "azimuth": media.orientation_azimuth,
-                "pitch": media.orientation_pitch,
-                "roll": media.orientation_roll
-            },
-            "trust_score": media.trust_score,
-            "user_id": media.user_id,
-            "file_path": media.file_path,
-            "verification_status": media.verification_status,
-            "thumbnail_path": media.thumbnail_path
-        }
-        
-        # Log successful upload
-        logger.info(f"Media upload succeeded: media_id={media.id}, user_id={user_id}")
-        
-        # Return 201 Created response
-        return JSONResponse(
-            content=response_data,
-            status_code=status.HTTP_201_CREATED
+            # Stored as raw digests; verification has already checked both are valid hex
+            client_media_hash=bytes.fromhex(media_hash),
+            client_metadata_hash=bytes.fromhex(metadata_hash),
+            upload_status=MediaUploadStatus.PENDING
         )
     except Exception as e:
         logger.error(f"Failed to create media record: {str(e)}")
+        os.unlink(upload_path)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to save media metadata"
         )
-    finally:
-        db.close()
+    logger.info(f"Pending media record created with ID {media.id}")
+
+    # Store the file (re-encoding videos) in the threadpool after responding
+    background_tasks.add_task(
+        _persist_upload, upload_path, base_name, unique_filename, file.content_type, media.id, db
+    )
+
+    # Construct response data
+    response_data = {
+        "id": media.id,
+        "capture_time": media.capture_time,
+        # The stored point was built from these same values
+        "lat": metadata.lat,
+        "lng": metadata.lng,
+        "orientation": {
+            "azimuth": media.orientation_azimuth,
+            "pitch": media.orientation_pitch,
+            "roll": media.orientation_roll
+        },
+        "trust_score": media.trust_score,
+        "user_id": media.user_id,
+        "file_path": media.file_path,
+        "verification_status": media.verification_status,
+        "thumbnail_path": media.thumbnail_path,
+        "upload_status": media.upload_status
+    }
+
+    # Log accepted upload
+    logger.info(f"Media upload accepted: media_id={media.id}, user_id={user_id}")
+
+    # Return 202 Accepted; clients poll GET /media/{id} until it is ready
+    return ORJSONResponse(
+        content=response_data,
+        status_code=status.HTTP_202_ACCEPTED
+    )
+
+def _media_list_chunks(rows: Iterator[Any]) -> Iterator[bytes]:
+    """
+    Yield the GET /media JSON body piece by piece, serializing one row at a time.
+    """
+    yield b'{"media":['
+    count = 0
+    for row in rows:
+        if count:
+            yield b","
+        # Rows come straight from our own columns, so skip per-row validation
+        yield orjson.dumps(MediaSchema.model_construct(**row).model_dump())
+        count += 1
+    yield b'],"count":' + str(count).encode() + b"}"
+    logger.info(f"Successfully retrieved {count} media records")
+
+def _stream_and_cache(chunks: Iterator[bytes], cache_key: tuple) -> Iterator[bytes]:
+    """
+    Pass response chunks through, caching the full body if it stays small enough.
+    """
+    cached: Optional[List[bytes]] = []
+    size = 0
+    try:
+        for chunk in chunks:
+            if cached is not None:
+                size += len(chunk)
+                if size <= MEDIA_QUERY_CACHE_MAX_BYTES:
+                    cached.append(chunk)
+                else:
+                    cached = None
+            yield chunk
+    except Exception as e:
+        # Headers are already sent, so all we can do is log and abort the response
+        logger.error(f"Failed to stream media records: {e}", exc_info=True)
+        raise
+    if cached is not None:
+        payload = b"".join(cached)
+        with _media_query_cache_lock:
+            _media_query_cache[cache_key] = payload
 
 @router.get("/media", response_model=MediaListResponse)
 async def get_media(
@@ -383,49 +550,72 @@ async def get_media(
     """
     logger.info(
         f"lat={filters.lat}, lng={filters.lng}, radius={filters.radius}, "
-        f"start_date={filters.start_date}, end_date={filters.end_date}"
+        f"start_date={filters.start_date}, end_date={filters.end_date}, "
+        f"limit={filters.limit}, offset={filters.offset}"
     )
 
+    lat = round(filters.lat, MEDIA_QUERY_COORD_PRECISION)
+    lng = round(filters.lng, MEDIA_QUERY_COORD_PRECISION)
+    cache_key = (lat, lng, filters.radius, filters.start_date, filters.end_date, filters.limit, filters.offset)
+    with _media_query_cache_lock:
+        cached_payload = _media_query_cache.get(cache_key)
+    if cached_payload is not None:
+        logger.info("Serving media records from the query cache")
+        return Response(content=cached_payload, media_type="application/json")
+
     try:
-        media_query = Media.filter(
-            session=db,
-            lat=filters.lat,
-            lng=filters.lng,
+        stmt = Media.filter(
+            lat=lat,
+            lng=lng,
             radius=filters.radius,
             start_date=filters.start_date,
-            end_date=filters.end_date
+            end_date=filters.end_date,
+            limit=filters.limit,
+            offset=filters.offset
         )
+
+        rows = db.execute(stmt.execution_options(yield_per=500)).mappings()
         
-        media_list = media_query.all()
-        logger.info(f"Successfully retrieved {len(media_list)} media records")
-
-        serialized_media = []
-        for media_item in media_list:
-            # Convert the location point to get lat/lng
-            location_point = to_shape(media_item.location)
-            
-            media_data = media_item.__dict__
-            
-            media_data['lat'] = location_point.y
-            media_data['lng'] = location_point.x
-            
-            media_schema = MediaSchema.model_validate(media_data)
-            
-            serialized_media.append(media_schema)
-        
-        return MediaListResponse(
-            count=len(serialized_media),
-            media=serialized_media
+        # Stream rows out as they are fetched rather than building the whole
+        # list first. The iterator is sync, so Starlette drives it (and the DB
+        # fetches behind it) in the threadpool. Returned as a response directly
+        # so FastAPI doesn't re-validate against response_model, which still
+        # documents the shape.
+        return StreamingResponse(
+            _stream_and_cache(_media_list_chunks(rows), cache_key),
+            media_type="application/json"
         )
     except Exception as e:
         logger.error(f"Failed to retrieve media records: {e}", exc_info=True)
         raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Failed to retrieve media records")
 
+@router.get("/media/{media_id}", response_model=MediaDetail)
+async def get_media_by_id(
+    media_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieve a single media item by ID, including its upload status.
+
+    Unlike GET /media this also returns media whose upload is still pending
+    or has failed, so clients can poll an upload after its 202 response.
+    """
+    try:
+        # Runs in a worker thread since the sync session blocks
+        row = await asyncio.to_thread(Media.find, session=db, media_id=media_id)
+    except Exception as e:
+        logger.error(f"Failed to retrieve media {media_id}: {e}", exc_info=True)
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Failed to retrieve media record")
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Media not found")
+    return MediaDetail.model_validate(dict(row))
+
 
 @router.delete("/media/{media_id}")
 async def delete_media(
     media_id: str,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """
     Delete a media item by ID.
@@ -433,34 +623,34 @@ async def delete_media(
     """
     # Log the start of the deletion attempt
     user_id = current_user.get("userId")
-    logger.info(f"User {current_user.id} attempting to delete media {media_id}")
+    logger.info(f"User {user_id} attempting to delete media {media_id}")
     
-    db = SessionLocal()
     try:
-        # Get the media record first to check ownership
-        media = db.query(Media).filter(Media.id == media_id).first()
-        if not media:
-            logger.warning(f"Media {media_id} not found for deletion")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Media not found"
-            )
-        
-        # Check if the current user is the owner or an admin
-        if media.user_id != user_id: # and not user_is_admin(): # Add admin check if needed
+        # Delete only if the current user owns the media item (add an admin check here if needed).
+        # Runs in a worker thread since the sync session blocks; the files are queued for the storage cleanup worker
+        deleted = await asyncio.to_thread(Media.delete, session=db, media_id=media_id, user_id=user_id)
+        if not deleted:
+            # Nothing matched the id and owner; a cheap probe, also off the event loop,
+            # tells missing from not permitted
+            exists = await asyncio.to_thread(Media.exists, session=db, media_id=media_id)
+            if not exists:
+                logger.warning(f"Media {media_id} not found for deletion")
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Media not found"
+                )
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied")
-        
-        # Proceed with deletion after permission check (handled at endpoint level)
-        Media.delete(session=db, media_id=media_id)
+        with _media_query_cache_lock:
+            _media_query_cache.clear()
         
         logger.info(f"Successfully deleted media {media_id}")
         return Response(status_code=status.HTTP_204_NO_CONTENT)
         
+    except HTTPException:
+        raise
     except ValueError as e:
         # Catch specific errors from the delete method for better responses
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"Unexpected error while deleting media {media_id}: {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to delete media")
-    finally:
-        db.close()
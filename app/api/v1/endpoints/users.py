@@ -1,11 +1,11 @@
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.middleware.auth import get_current_user
 from app.services.user_service import UserService
-from app.db.session import get_db
+from app.db.session import get_async_db
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +18,7 @@ async def delete_current_user(
     # If the token is invalid or the user doesn't exist, it will raise a 401 error.
     # If successful, 'current_user' will be a dict like: {'userId': ..., 'provider': ..., 'roles': ...}
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Soft delete the currently authenticated user's account by deactivating it.
@@ -33,7 +33,7 @@ async def delete_current_user(
         # The dependency already confirmed the user exists, but we fetch the
         # full User model object to perform the deletion.
         user_service = UserService(db)
-        user = user_service.find_user_by_provider_id(provider, provider_id)
+        user = await user_service.find_user_by_provider_id(provider, provider_id)
         
         # This check is good practice, though login_required should prevent this.
         if not user:
@@ -49,8 +49,7 @@ async def delete_current_user(
             return Response(status_code=status.HTTP_204_NO_CONTENT)
         
         # Attempt to deactivate the account using the internal database ID
-        user_service.delete_user(user.id)
-        user_service.close()
+        await user_service.delete_user(user.id)
         
         logger.info(f"Successfully deactivated account: {user.id}")
         return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,8 +1,26 @@
 import logging
 from logging.config import dictConfig
 import sys
+import orjson
 from .config import settings
 
+
+class JsonFormatter(logging.Formatter):
+    """Format each record as a single-line JSON object for log ingestion."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+
 # Define log configuration
 log_config = {
     "version": 1,
@@ -11,12 +29,15 @@ log_config = {
         "default": {
             "format": "%(asctime)s [%(levelname)s] %(name)s:%(lineno)d - %(message)s",
         },
+        "json": {
+            "()": JsonFormatter,
+        },
     },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
             "level": "DEBUG" if settings.DEBUG else "INFO",
-            "formatter": "default",
+            "formatter": "json" if settings.LOG_JSON else "default",
             "stream": sys.stdout,
         },
     },
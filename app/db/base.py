@@ -1 +1,21 @@
-from app.db.session import Base, SessionLocal
+from geoalchemy2 import Geography, Geometry
+from app.db.session import Base, SessionLocal, AsyncSessionLocal
+
+
+class CacheableGeography(Geography):
+    """
+    GeoAlchemy2's Geography with SQLAlchemy's compiled statement cache
+    allowed.
+
+    GeoAlchemy2 marks its types cache_ok = False, so every statement
+    touching a geography column is compiled from scratch on every call.
+    The type's parameters (geometry type, SRID, flags) are plain hashable
+    values, which is all the cache key needs.
+    """
+    cache_ok = True
+
+
+class CacheableGeometry(Geometry):
+    """GeoAlchemy2's Geometry with the compiled statement cache allowed; see CacheableGeography."""
+    cache_ok = True
+
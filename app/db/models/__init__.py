@@ -4,16 +4,24 @@ from .claim import Claim
 from .comment import Comment
 from .user import User
 from .media import Media
+from .media_trust_daily import MediaTrustDaily
 from .verification import Verification
 from .trust_metric import TrustMetric
+from .user_trust_cache import UserTrustCache
 from .user_interaction import UserInteraction
+from .interaction_rollup import InteractionRollup
+from .storage_deletion import StorageDeletion
 
 __all__ = [
     'User',
     'Comment',
     'Media',
+    'MediaTrustDaily',
     'Claim',
     'Verification',
     'TrustMetric',
-    'UserInteraction'
+    'UserTrustCache',
+    'UserInteraction',
+    'InteractionRollup',
+    'StorageDeletion'
 ]
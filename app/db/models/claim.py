@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Foreign
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..base import Base
+from .enums import ClaimStatus, pg_enum
 
 class Claim(Base):
     __tablename__ = 'claims'
@@ -13,13 +14,17 @@ class Claim(Base):
     claim_type = Column(String(50))  # news, social_media, video, etc.
     claim_source = Column(String(255))  # URL or source reference
     claim_date = Column(DateTime(timezone=True))
-    verified_status = Column(String(20), default='pending')  # pending, verified, debunked
+    verified_status = Column(pg_enum(ClaimStatus, 'claim_status'), default=ClaimStatus.PENDING)
     confidence_score = Column(Float, default=0.0)
     summary = Column(Text)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="claims")
-    verifications = relationship("Verification", back_populates="claim", cascade="all, delete-orphan")
+    # Claims are almost always shown with their verifications, so load them
+    # for a whole batch of claims in one IN query rather than one per claim.
+    # Deleting a claim leaves its verifications to the FK's ON DELETE CASCADE
+    verifications = relationship("Verification", back_populates="claim", cascade="all, delete-orphan",
+                                 lazy="selectin", passive_deletes=True)
@@ -1,11 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, func, insert, select, exists, literal
 from ..base import Base
+from .media import Media
 
 class Comment(Base):
     __tablename__ = 'comments'
+    __table_args__ = (
+        # Serves both the media_id lookup and the created_at ordering of a media item's comments
+        Index('ix_comments_media_id_created_at', 'media_id', 'created_at'),
+    )
 
     id = Column(Integer, primary_key=True)
-    media_id = Column(String, index=True)
+    media_id = Column(String)
     text = Column(Text)
     user_id = Column(String)
     created_at = Column(DateTime, default=func.now())
@@ -29,19 +34,112 @@ class Comment(Base):
         return comment
 
     @classmethod
-    def filter(cls, session, **kwargs):
+    def create_for_media(cls, session, media_id, text, user_id):
+        """
+        Create a comment only if the media item it belongs to exists.
+
+        The existence check and the insert are issued as a single
+        INSERT ... SELECT ... WHERE EXISTS ... RETURNING statement.
+
+        Parameters:
+        - session: SQLAlchemy session object
+        - media_id: ID of the media item being commented on
+        - text: comment text
+        - user_id: ID of the commenting user
+
+        Returns:
+        - Saved Comment instance, or None if the media item does not exist
+        """
+        media_exists = exists().where(Media.id == media_id)
+        stmt = (
+            insert(cls)
+            .from_select(
+                ['media_id', 'text', 'user_id', 'created_at'],
+                select(
+                    literal(media_id, String),
+                    literal(text, Text),
+                    literal(user_id, String),
+                    func.now()
+                ).where(media_exists)
+            )
+            .returning(cls)
+        )
+        comment = session.execute(stmt).scalars().first()
+        session.commit()
+        return comment
+
+    @classmethod
+    def list_for_media(cls, session, media_id, limit, offset=0):
+        """
+        Fetch one page of a media item's comments, newest first.
+
+        Only the columns needed for the response are selected and rows are
+        returned as mappings, skipping ORM object construction.
+
+        Parameters:
+        - session: SQLAlchemy session object
+        - media_id: ID of the media item
+        - limit: maximum number of comments to return
+        - offset: number of comments to skip
+
+        Returns:
+        - List of row mappings with id, media_id, text, user_id and created_at
+        """
+        stmt = (
+            select(cls.id, cls.media_id, cls.text, cls.user_id, cls.created_at)
+            .where(cls.media_id == media_id)
+            .order_by(cls.created_at.desc(), cls.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        return session.execute(stmt).mappings().all()
+
+    @classmethod
+    def _filter_statement(cls, criteria):
+        """
+        Build a SELECT of comments matching column == value criteria, ordered
+        by id. Keys that are not columns are ignored.
+        """
+        columns = cls.__table__.c
+        stmt = select(cls)
+        for key, value in criteria.items():
+            if key in columns:
+                stmt = stmt.where(columns[key] == value)
+        return stmt.order_by(cls.id)
+
+    @classmethod
+    def filter(cls, session, limit=None, offset=0, **kwargs):
         """
         Filter Comment instances based on provided parameters.
 
         Parameters:
         - session: SQLAlchemy session object
+        - limit: maximum number of comments to return (all when None)
+        - offset: number of comments to skip
         - kwargs: filter criteria
 
         Returns:
-        - List of Comment instances matching the criteria
+        - List of Comment instances matching the criteria, ordered by id
+        """
+        stmt = cls._filter_statement(kwargs).limit(limit).offset(offset)
+        return session.execute(stmt).scalars().all()
+
+    @classmethod
+    def stream(cls, session, batch_size=1000, **kwargs):
+        """
+        Iterate over Comment instances matching the criteria in batches.
+
+        Rows are fetched batch_size at a time from a server-side cursor, so
+        large result sets are never loaded in full.
+
+        Parameters:
+        - session: SQLAlchemy session object
+        - batch_size: number of rows fetched per round trip
+        - kwargs: filter criteria
+
+        Yields:
+        - Comment instances matching the criteria, ordered by id
         """
-        query = session.query(cls)
-        for key, value in kwargs.items():
-            if hasattr(cls, key):
-                query = query.filter(getattr(cls, key) == value)
-        return query.all()
+        stmt = cls._filter_statement(kwargs).execution_options(yield_per=batch_size)
+        for partition in session.execute(stmt).scalars().partitions():
+            yield from partition
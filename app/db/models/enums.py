@@ -0,0 +1,38 @@
+import enum
+from sqlalchemy import Enum
+
+# str-valued so members compare equal to, and serialize as, their plain values
+
+class ClaimStatus(str, enum.Enum):
+    PENDING = "pending"
+    VERIFIED = "verified"
+    DEBUNKED = "debunked"
+
+class TrustMetricType(str, enum.Enum):
+    USER_TRUST = "user_trust"
+    CLAIM_CREDIBILITY = "claim_credibility"
+    VERIFICATION_QUALITY = "verification_quality"
+
+class InteractionType(str, enum.Enum):
+    VOTE = "vote"
+    COMMENT = "comment"
+    SHARE = "share"
+    FOLLOW = "follow"
+
+class MediaVerificationStatus(str, enum.Enum):
+    UNVERIFIED = "UNVERIFIED"
+    VERIFIED = "VERIFIED"
+    VERIFIED_SIGNATURE_ONLY = "VERIFIED_SIGNATURE_ONLY"
+    VERIFIED_WITH_HARDWARE_ATTESTATION = "VERIFIED_WITH_HARDWARE_ATTESTATION"
+
+class MediaUploadStatus(str, enum.Enum):
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+def pg_enum(enum_class, name):
+    """
+    Column type storing ``enum_class`` as a native PostgreSQL ENUM whose
+    labels are the members' values, so existing string data maps 1:1.
+    """
+    return Enum(enum_class, name=name, values_callable=lambda members: [m.value for m in members])
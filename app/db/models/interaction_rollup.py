@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey, func, select
+from ..base import Base
+
+class InteractionRollup(Base):
+    """
+    Per-claim, per-day (UTC) vote and share counts from user_interactions.
+
+    Maintained by a trigger on user_interactions that upserts only the
+    bucket each inserted, updated or deleted interaction falls in, so the
+    counts are always current and never need a full recompute. Treat the
+    table as read-only from the application.
+    """
+    __tablename__ = 'interaction_rollup'
+
+    claim_id = Column(Integer, ForeignKey('claims.id', ondelete='CASCADE'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    upvotes = Column(Integer, nullable=False, default=0)
+    downvotes = Column(Integer, nullable=False, default=0)
+    shares = Column(Integer, nullable=False, default=0)
+
+    @classmethod
+    def totals(cls, session, claim_id):
+        """
+        Return the (upvotes, downvotes, shares) a claim has received, read
+        from its daily buckets instead of summing its interactions.
+        """
+        stmt = select(
+            func.coalesce(func.sum(cls.upvotes), 0),
+            func.coalesce(func.sum(cls.downvotes), 0),
+            func.coalesce(func.sum(cls.shares), 0)
+        ).where(cls.claim_id == claim_id)
+        return tuple(session.execute(stmt).one())
@@ -1,19 +1,90 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, func, LargeBinary, Text
+from sqlalchemy import CheckConstraint, Column, Integer, String, Float, DateTime, Index, func, LargeBinary, Text, cast, select, text, tuple_, bindparam, insert, update, delete as sa_delete
 from datetime import datetime, timezone
-from geoalchemy2 import Geography
+import csv
+import io
+import os
+import time
 import uuid
-from ..base import Base
+from ..base import Base, CacheableGeography, CacheableGeometry
+from .enums import MediaUploadStatus, MediaVerificationStatus, pg_enum
+from .storage_deletion import StorageDeletion
 from app.core.logging import logger
 
+def make_point(lat, lng):
+    """
+    Build a geography POINT from lat/lng server-side, with both bound as parameters.
+    """
+    return cast(
+        func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326),
+        CacheableGeography(geometry_type='POINT', srid=4326)
+    )
+
+def uuid7() -> uuid.UUID:
+    """
+    Return an RFC 9562 version 7 UUID: a 48-bit Unix millisecond timestamp
+    followed by 74 random bits.
+
+    Ids minted later sort later (to the millisecond), so new rows append to
+    the right edge of the primary key index instead of random leaves.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), 'big')
+    rand_a = rand >> 68                  # top 12 bits
+    rand_b = rand & ((1 << 62) - 1)      # low 62 bits
+    value = (
+        (timestamp_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | rand_a << 64
+        | 0b10 << 62
+        | rand_b
+    )
+    return uuid.UUID(int=value)
+
+# Rows per multi-VALUES INSERT statement in Media.bulk_create
+BULK_INSERT_PAGE_SIZE = 500
+# Batches of at least this many rows are loaded with COPY instead
+COPY_THRESHOLD = 100
+
+# Columns Media.bulk_create loads with COPY, in order
+COPY_COLUMNS = (
+    'id', 'created_at', 'capture_time', 'location', 'orientation_azimuth', 'orientation_pitch',
+    'orientation_roll', 'trust_score', 'user_id', 'file_path', 'thumbnail_path', 'verification_status',
+    'signature', 'public_key', 'client_media_hash', 'client_metadata_hash', 'attestation_chain'
+)
+COPY_NULL = '\\N'
+
+def _copy_value(value):
+    """Render one value as PostgreSQL COPY CSV input."""
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, (bytes, bytearray)):
+        return '\\x' + value.hex()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    # Enum members go in as their value
+    return getattr(value, 'value', value)
+
 class Media(Base):
     __tablename__ = 'media'
+    __table_args__ = (
+        # Serves newest-first listing and keyset pagination without a sort
+        Index('idx_media_capture_time', 'capture_time', 'id'),
+        # Covers a user's newest-first feed with an index-only scan
+        Index(
+            'idx_media_user_time',
+            'user_id', text('capture_time DESC'), text('id DESC'),
+            postgresql_include=['trust_score', 'file_path']
+        ),
+        CheckConstraint('octet_length(client_media_hash) = 32', name='ck_media_client_media_hash_len'),
+        CheckConstraint('octet_length(client_metadata_hash) = 32', name='ck_media_client_metadata_hash_len'),
+    )
 
     id = Column(String, primary_key=True)
     title = Column(String)
     description = Column(String)
     user_id = Column(String)
     created_at = Column(DateTime(timezone=True), default=func.now())
-    location = Column(Geography(geometry_type='POINT', srid=4326))
+    location = Column(CacheableGeography(geometry_type='POINT', srid=4326))
     orientation_azimuth = Column(Float)
     orientation_pitch = Column(Float)
     orientation_roll = Column(Float)
@@ -21,25 +92,44 @@ class Media(Base):
     file_path = Column(String)
     capture_time = Column(DateTime(timezone=True))
 
-    verification_status = Column(String, nullable=False, default="UNVERIFIED")
+    verification_status = Column(
+        pg_enum(MediaVerificationStatus, 'media_verification_status'),
+        nullable=False,
+        default=MediaVerificationStatus.UNVERIFIED
+    )
     signature = Column(LargeBinary, nullable=True)
     public_key = Column(LargeBinary, nullable=True)
-    client_media_hash = Column(String, nullable=True)
-    client_metadata_hash = Column(String, nullable=True)
+    # Raw SHA-256 digests
+    client_media_hash = Column(LargeBinary(32), nullable=True)
+    client_metadata_hash = Column(LargeBinary(32), nullable=True)
     thumbnail_path = Column(String, nullable=True)
     attestation_chain = Column(Text, nullable=True)
+    # PENDING until the uploaded file is in storage; only READY media is listed
+    upload_status = Column(
+        pg_enum(MediaUploadStatus, 'media_upload_status'),
+        nullable=False,
+        default=MediaUploadStatus.READY,
+        server_default=MediaUploadStatus.READY.value
+    )
 
     @classmethod
     def create(cls, db, capture_time, lat, lng, orientation_azimuth, orientation_pitch, orientation_roll,
                trust_score, user_id, file_path, verification_status, signature, public_key,
-               client_media_hash, client_metadata_hash, thumbnail_path=None, attestation_chain=None):
-        media_id = str(uuid.uuid4())
-        location_point = f'SRID=4326;POINT({lng} {lat})'
-        
-        media = cls(
-            id=media_id,
+               client_media_hash, client_metadata_hash, thumbnail_path=None, attestation_chain=None,
+               upload_status=MediaUploadStatus.READY):
+        """
+        Insert a media record and commit.
+
+        A single INSERT ... RETURNING writes the row and reads back every
+        column, including server-generated ones, so no refresh SELECT is
+        needed. The returned Media is detached from the session: its
+        attributes are plain values that commit() does not expire.
+        """
+        stmt = insert(cls.__table__).values(
+            id=str(uuid7()),
             capture_time=capture_time,
-            location=location_point,
+            # Build the point server-side in the INSERT itself, with lat/lng as bound parameters
+            location=make_point(lat, lng),
             orientation_azimuth=orientation_azimuth,
             orientation_pitch=orientation_pitch,
             orientation_roll=orientation_roll,
@@ -52,82 +142,240 @@ class Media(Base):
             public_key=public_key,
             client_media_hash=client_media_hash,
             client_metadata_hash=client_metadata_hash,
-            attestation_chain=attestation_chain
-        )
-        
+            attestation_chain=attestation_chain,
+            upload_status=upload_status
+        ).returning(*cls.__table__.c)
+
+        try:
+            row = db.execute(stmt).one()
+            db.commit()
+            return cls(**row._mapping)
+        except Exception as e:
+            db.rollback()
+            raise e
+
+    @classmethod
+    def bulk_create(cls, db, rows):
+        """
+        Insert many media records and commit.
+
+        Each row is a dict of the same fields create() takes (lat/lng rather
+        than a location). Ids are generated here, so no RETURNING is needed.
+        Batches below COPY_THRESHOLD go in one executemany, which SQLAlchemy
+        packs into multi-VALUES INSERTs; larger ones are streamed with COPY.
+
+        Returns:
+            The new ids, in the order of ``rows``.
+        """
+        params = []
+        for row in rows:
+            row = dict(row, id=str(uuid7()))
+            row.setdefault('thumbnail_path', None)
+            row.setdefault('attestation_chain', None)
+            params.append(row)
+        if not params:
+            return []
+
         try:
-            db.add(media)
+            if len(params) >= COPY_THRESHOLD:
+                cls._copy_rows(db, params)
+            else:
+                stmt = insert(cls.__table__).values(
+                    location=make_point(bindparam('lat', type_=Float), bindparam('lng', type_=Float))
+                ).execution_options(insertmanyvalues_page_size=BULK_INSERT_PAGE_SIZE)
+                db.execute(stmt, params)
             db.commit()
-            db.refresh(media)
-            return media
         except Exception as e:
             db.rollback()
             raise e
+        return [row['id'] for row in params]
 
     @classmethod
-    def filter(cls, session, lat=None, lng=None, radius=None, start_date=None, end_date=None):
+    def _copy_rows(cls, db, params):
+        """
+        Load rows with COPY ... FROM STDIN on the session's connection, in
+        its transaction. The location goes in as EWKT, which the geography
+        column parses on input; created_at and the verification status
+        default are filled in here since COPY skips column defaults.
         """
-        Filter Media instances based on geolocation (with radius in meters) and optional time range.
+        created_at = datetime.now(timezone.utc)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in params:
+            values = dict(
+                row,
+                created_at=created_at,
+                location=f"SRID=4326;POINT({float(row['lng'])} {float(row['lat'])})",
+            )
+            values.setdefault('verification_status', MediaVerificationStatus.UNVERIFIED)
+            writer.writerow([_copy_value(values.get(column)) for column in COPY_COLUMNS])
+        buffer.seek(0)
+
+        copy_sql = (
+            f"COPY {cls.__tablename__} ({', '.join(COPY_COLUMNS)}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+        )
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(copy_sql, buffer)
+        finally:
+            cursor.close()
+
+    @classmethod
+    def _response_columns(cls):
+        """
+        The columns a media response needs, with lat/lng extracted by PostGIS
+        so callers get plain floats back instead of WKB to parse per row.
+        """
+        location = cast(cls.location, CacheableGeometry)
+        return (
+            cls.id,
+            cls.user_id,
+            cls.capture_time,
+            cls.file_path,
+            cls.thumbnail_path,
+            cls.trust_score,
+            cls.verification_status,
+            cls.orientation_azimuth,
+            cls.orientation_pitch,
+            cls.orientation_roll,
+            func.ST_Y(location).label('lat'),
+            func.ST_X(location).label('lng')
+        )
+
+    @classmethod
+    def filter(cls, lat=None, lng=None, radius=None, start_date=None, end_date=None, limit=None, offset=0):
+        """
+        Build a SELECT of the columns the media list response needs, filtered on
+        geolocation (with radius in meters) and optional time range. Media
+        whose upload has not been stored yet (or failed) is left out.
+
+        When paginated with limit/offset, results are ordered newest capture
+        first (ties broken on id) so pages are stable.
         """
         logger.info(
             f"Filtering with: lat={lat}, lng={lng}, radius={radius}, "
             f"start_date={start_date}, end_date={end_date}"
         )
 
-        query = session.query(cls)
+        stmt = select(*cls._response_columns()).where(cls.upload_status == MediaUploadStatus.READY)
     
         # Apply geofence filtering if all location parameters are provided
         if lat is not None and lng is not None and radius is not None:
-            # Create a point from the input lat/lng
-            point = f'POINT({lng} {lat})' 
-            # Use the efficient ST_DWithin function which uses the index
-            query = query.filter(func.ST_DWithin(cls.location, point, radius))
+            # ST_DWithin on the geography column is served by the GIST index
+            stmt = stmt.where(func.ST_DWithin(cls.location, make_point(lat, lng), radius))
     
         # Apply time range filtering
-        # Your model has `capture_time`, not `created_at` for this field. Use the correct one.
-        # If the column is actually `created_at`, change `cls.capture_time` to `cls.created_at`.
         if start_date is not None:
-            query = query.filter(cls.capture_time >= start_date)
+            stmt = stmt.where(cls.capture_time >= start_date)
         if end_date is not None:
-            query = query.filter(cls.capture_time <= end_date)
-    
-        return query
+            stmt = stmt.where(cls.capture_time <= end_date)
+
+        if limit is not None or offset:
+            stmt = stmt.order_by(cls.capture_time.desc(), cls.id.desc()).limit(limit).offset(offset)
     
+        return stmt
 
     @classmethod
-    def delete(cls, session, media_id: str) -> bool:
+    def list_recent(cls, session, before=None, limit=500, chunk=500, user_id=None):
         """
-        Deletes a media record and its associated file(s) from storage.
+        Iterate over Media instances newest capture first (ties broken on id),
+        optionally only those uploaded by ``user_id``.
+
+        Pages are keyed on (capture_time, id) rather than an offset: pass the
+        (capture_time, id) of the last row yielded as ``before`` to continue
+        after it. Rows are fetched ``chunk`` at a time from a server-side
+        cursor, so memory stays bounded however many rows are listed.
+
+        Media without a capture time sort first (NULLs come first in
+        descending order) and never match a cursor. Only media whose upload
+        has been stored is listed.
         """
-        from app.services.storage import delete_file
+        stmt = (
+            select(cls)
+            .where(cls.upload_status == MediaUploadStatus.READY)
+            .order_by(cls.capture_time.desc(), cls.id.desc())
+            .limit(limit)
+        )
+        if user_id is not None:
+            stmt = stmt.where(cls.user_id == user_id)
+        if before is not None:
+            stmt = stmt.where(tuple_(cls.capture_time, cls.id) < tuple_(*before))
 
-        media = session.query(cls).filter(cls.id == media_id).first()
-        if not media:
-            raise ValueError("Media not found")
+        result = session.execute(stmt.execution_options(yield_per=chunk)).scalars()
+        for partition in result.partitions():
+            yield from partition
 
-        # Get paths before deleting the record
-        file_path_to_delete = media.file_path
-        thumbnail_path_to_delete = media.thumbnail_path
-        
+    @classmethod
+    def find(cls, session, media_id: str):
+        """
+        Return the response columns of a media record, plus its upload status,
+        as a mapping, or None if there is no media with this ID.
+
+        Unlike filter(), this also finds media whose upload is still pending
+        or has failed, so clients can poll an upload they just made.
+        """
+        stmt = select(*cls._response_columns(), cls.upload_status).where(cls.id == media_id)
+        return session.execute(stmt).mappings().first()
+
+    @classmethod
+    def finish_upload(cls, session, media_id: str, upload_status: MediaUploadStatus, thumbnail_path=None) -> None:
+        """
+        Record the outcome of storing a pending upload and commit.
+
+        Args:
+            upload_status: READY once the file is stored, FAILED otherwise.
+            thumbnail_path: The stored thumbnail's path, if one was made.
+        """
+        stmt = (
+            update(cls)
+            .where(cls.id == media_id)
+            .values(upload_status=upload_status, thumbnail_path=thumbnail_path)
+        )
         try:
-            # Delete from database first within the transaction
-            session.delete(media)
-            
-            # Delete main file from storage
-            if file_path_to_delete:
-                filename = file_path_to_delete.split('/')[-1]
-                if not delete_file(filename):
-                    # Raise error to trigger a rollback
-                    raise ValueError(f"Failed to delete main file {filename} from storage.")
-
-            # Delete thumbnail from storage if it exists
-            if thumbnail_path_to_delete:
-                thumb_filename = thumbnail_path_to_delete.split('/')[-1]
-                if not delete_file(thumb_filename):
-                    # Raise error to trigger a rollback
-                    raise ValueError(f"Failed to delete thumbnail {thumb_filename} from storage.")
-            
-            # If all deletions succeed, commit the transaction
+            session.execute(stmt)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to mark media {media_id} {upload_status.value} due to: {str(e)}")
+            raise e
+
+    @classmethod
+    def exists(cls, session, media_id: str) -> bool:
+        """Return True if a media record with this ID exists, without loading it."""
+        return session.execute(select(cls.id).where(cls.id == media_id)).first() is not None
+
+    @classmethod
+    def delete(cls, session, media_id: str, user_id: str) -> bool:
+        """
+        Deletes a media record owned by ``user_id`` and queues its stored
+        file(s) for deletion.
+
+        The ownership check and the delete are a single
+        DELETE ... WHERE id AND user_id RETURNING statement. The files are
+        not touched here: a StorageDeletion row per file is inserted in the
+        same transaction, and the storage cleanup worker removes them once
+        it has committed.
+
+        Returns:
+            True if the record was deleted, False if no media with this ID is
+            owned by the user (it may not exist, or belong to someone else).
+        """
+        stmt = (
+            sa_delete(cls)
+            .where(cls.id == media_id, cls.user_id == user_id)
+            .returning(cls.file_path, cls.thumbnail_path)
+        )
+
+        try:
+            deleted = session.execute(stmt).first()
+            if deleted is None:
+                session.rollback()
+                return False
+
+            paths = [path.split('/')[-1] for path in deleted if path]
+            if paths:
+                session.execute(insert(StorageDeletion), [{'path': path} for path in paths])
             session.commit()
         except Exception as e:
             session.rollback()
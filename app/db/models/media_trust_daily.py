@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, Float, DateTime, Table, text
+from ..base import Base, CacheableGeometry
+
+# Grid size, in degrees, media locations are snapped to for the rollup
+MEDIA_TRUST_CELL_DEGREES = 0.1
+
+class MediaTrustDaily(Base):
+    """
+    Read-only mapping of the media_trust_daily materialized view: media
+    count and average trust score per day per 0.1 degree grid cell.
+
+    The view is created by a migration; the ``is_view`` flag keeps
+    autogenerate from treating it as a table. It is only as fresh as its
+    last refresh().
+    """
+    __table__ = Table(
+        'media_trust_daily',
+        Base.metadata,
+        Column('day', DateTime(timezone=True), primary_key=True),
+        Column('cell', CacheableGeometry(geometry_type='POINT', srid=4326, spatial_index=False), primary_key=True),
+        Column('n', Integer, nullable=False),
+        Column('avg_trust', Float),
+        info={'is_view': True}
+    )
+
+    @staticmethod
+    async def refresh(connection) -> None:
+        """
+        Recompute the view from media. CONCURRENTLY keeps it readable while
+        the refresh runs (this needs its unique (day, cell) index).
+        """
+        await connection.execute(text('REFRESH MATERIALIZED VIEW CONCURRENTLY media_trust_daily'))
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, text
+from sqlalchemy.sql import func
+from ..base import Base
+
+class StorageDeletion(Base):
+    """
+    Outbox of storage objects to delete.
+
+    A row is written in the same transaction that deletes the database
+    record owning the object, so the two can never disagree; the storage
+    cleanup worker deletes the object afterwards and sets done_at,
+    retrying failures.
+    """
+    __tablename__ = 'storage_deletions'
+    __table_args__ = (
+        # The worker only ever reads the pending rows, oldest first
+        Index('ix_storage_deletions_pending', 'enqueued_at', postgresql_where=text('done_at IS NULL')),
+    )
+
+    id = Column(Integer, primary_key=True)
+    path = Column(String, nullable=False)  # object key passed to delete_file
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    enqueued_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    done_at = Column(DateTime(timezone=True))
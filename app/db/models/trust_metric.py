@@ -1,24 +1,63 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Float, Enum, Index
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Float, Enum, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..base import Base
+from .enums import TrustMetricType, pg_enum
 
 class TrustMetric(Base):
     __tablename__ = 'trust_metrics'
+    __table_args__ = (
+        # One row per metric dimension; NULL claim/context count as a value,
+        # so a user-level metric cannot be duplicated either
+        UniqueConstraint('user_id', 'claim_id', 'metric_type', 'context',
+                         name='uq_trust_metric_dim', postgresql_nulls_not_distinct=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     claim_id = Column(Integer, ForeignKey('claims.id'))
     verification_id = Column(Integer, ForeignKey('verifications.id'))
     trust_score = Column(Float, default=0.0)
-    metric_type = Column(String(50), nullable=False)  # user_trust, claim_credibility, verification_quality
+    metric_type = Column(pg_enum(TrustMetricType, 'trust_metric_type'), nullable=False)
     context = Column(String(100))  # political_bias, scientific_accuracy, etc.
     weight = Column(Float, default=1.0)
     explanation = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    # Relationships
-    user = relationship("User")
-    claim = relationship("Claim")
-    verification = relationship("Verification")
+    # Relationships; never lazy-loaded with SQL, so callers must load them
+    # up front (selectinload/joinedload) instead of issuing a query per row
+    user = relationship("User", lazy="raise_on_sql")
+    claim = relationship("Claim", lazy="raise_on_sql")
+    verification = relationship("Verification", lazy="raise_on_sql")
+
+    @classmethod
+    def upsert(cls, session, user_id, metric_type, trust_score, claim_id=None, verification_id=None,
+               context=None, weight=1.0, explanation=None):
+        """
+        Record a metric, replacing the score of an existing metric with the
+        same (user_id, claim_id, metric_type, context) instead of adding a
+        row. The caller is responsible for committing.
+        """
+        stmt = insert(cls).values(
+            user_id=user_id,
+            claim_id=claim_id,
+            verification_id=verification_id,
+            metric_type=metric_type,
+            context=context,
+            trust_score=trust_score,
+            weight=weight,
+            explanation=explanation
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint='uq_trust_metric_dim',
+            set_={
+                'verification_id': stmt.excluded.verification_id,
+                'trust_score': stmt.excluded.trust_score,
+                'weight': stmt.excluded.weight,
+                'explanation': stmt.excluded.explanation,
+                'updated_at': func.now()
+            }
+        )
+        session.execute(stmt)
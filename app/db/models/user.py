@@ -1,10 +1,16 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Float, Enum, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..base import Base
 
 class User(Base):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Sign-in and token checks look users up by (provider, provider_id),
+        # and sign-in upserts on it with ON CONFLICT
+        Index('users_provider_providerid_key', 'provider', 'provider_id', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50), unique=True, index=True, nullable=False)
@@ -18,10 +24,11 @@ class User(Base):
     bio = Column(Text)
     provider = Column(String(50), default='native')
     provider_id = Column(String(255))
-    social_links = Column(JSON)
+    social_links = Column(JSONB)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
-    verifications = relationship("Verification", back_populates="user", cascade="all, delete-orphan")
-    claims = relationship("Claim", back_populates="user", cascade="all, delete-orphan")
+    # Removed by the FKs' ON DELETE CASCADE rather than loaded and deleted one by one
+    verifications = relationship("Verification", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    claims = relationship("Claim", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
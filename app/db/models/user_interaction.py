@@ -1,25 +1,33 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Float, Enum, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..base import Base
+from .enums import InteractionType, pg_enum
 
 class UserInteraction(Base):
     __tablename__ = 'user_interactions'
+    __table_args__ = (
+        # jsonb_path_ops only serves @>, with smaller keys than the default opclass
+        Index('idx_interactions_metadata', 'metadata', postgresql_using='gin',
+              postgresql_ops={'metadata': 'jsonb_path_ops'}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     target_user_id = Column(Integer, ForeignKey('users.id'))
     claim_id = Column(Integer, ForeignKey('claims.id'))
     verification_id = Column(Integer, ForeignKey('verifications.id'))
-    interaction_type = Column(String(50), nullable=False)  # vote, comment, share, follow, etc.
+    interaction_type = Column(pg_enum(InteractionType, 'interaction_type'), nullable=False)
     value = Column(Float)  # +1 for upvote, -1 for downvote, etc.
     content = Column(Text)  # comment text, etc.
-    metadata_ = Column("metadata", JSON)  # additional data
+    metadata_ = Column("metadata", JSONB)  # additional data
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    # Relationships
-    user = relationship("User", foreign_keys=[user_id])
-    target_user = relationship("User", foreign_keys=[target_user_id])
-    claim = relationship("Claim")
-    verification = relationship("Verification")
+    # Relationships; never lazy-loaded with SQL, so callers must load them
+    # up front (selectinload/joinedload) instead of issuing a query per row
+    user = relationship("User", foreign_keys=[user_id], lazy="raise_on_sql")
+    target_user = relationship("User", foreign_keys=[target_user_id], lazy="raise_on_sql")
+    claim = relationship("Claim", lazy="raise_on_sql")
+    verification = relationship("Verification", lazy="raise_on_sql")
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from ..base import Base
+
+class UserTrustCache(Base):
+    """
+    A user's current trust score: the weight-averaged trust_score of their
+    user_trust metrics.
+
+    Maintained by a trigger on trust_metrics that recomputes only the
+    affected user, so reads are a primary key lookup. Treat the table as
+    read-only from the application.
+    """
+    __tablename__ = 'user_trust_cache'
+
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    trust_score = Column(Float)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,25 +1,32 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Float, Enum, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..base import Base
 
 class Verification(Base):
     __tablename__ = 'verifications'
+    __table_args__ = (
+        # Containment (@>) lookups on tags and sources
+        Index('idx_verifications_tags', 'tags', postgresql_using='gin'),
+        Index('idx_verifications_sources', 'sources', postgresql_using='gin'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    claim_id = Column(Integer, ForeignKey('claims.id'), nullable=False)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    claim_id = Column(Integer, ForeignKey('claims.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     verification_text = Column(Text, nullable=False)
     context = Column(Text)
     evidence = Column(Text)
     confidence_score = Column(Float, default=0.0)
-    tags = Column(JSON)
+    tags = Column(JSONB)
     is_verified = Column(Boolean, default=False)
-    sources = Column(JSON)
+    sources = Column(JSONB)
     rating = Column(Integer)  # 1-5 star rating
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    # Relationships
-    claim = relationship("Claim", back_populates="verifications")
-    user = relationship("User", back_populates="verifications")
+    # Relationships; never lazy-loaded with SQL, so callers must load them
+    # up front (selectinload/joinedload) instead of issuing a query per row
+    claim = relationship("Claim", back_populates="verifications", lazy="raise_on_sql")
+    user = relationship("User", back_populates="verifications", lazy="raise_on_sql")
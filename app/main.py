@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 import asyncio
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,7 +7,10 @@ from app.api.v1.endpoints.auth import router as auth_router
 from app.api.v1.endpoints.media import router as media_router
 from app.api.v1.endpoints.comments import router as comments_router
 from app.api.v1.endpoints.users import router as users_router
-from app.services import verification
+from app.middleware.upload_limit import RequestSizeLimitMiddleware
+from app.middleware.db_session import DBSessionMiddleware
+from app.services import storage_cleanup, trust, verification
+from app.services.auth import apple_auth
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -21,6 +25,12 @@ async def lifespan(app: FastAPI):
     print("Starting background task for attestation root updates...")
     update_task = asyncio.create_task(verification.periodic_root_update_task())
 
+    # 3. Keep the media_trust_daily rollup fresh
+    rollup_task = asyncio.create_task(trust.periodic_trust_rollup_refresh_task())
+
+    # 4. Delete stored files queued by deleted records
+    cleanup_task = asyncio.create_task(storage_cleanup.periodic_storage_cleanup_task())
+
     yield # --- The application is now running ---
 
     # --- Code to run on shutdown ---
@@ -30,8 +40,22 @@ async def lifespan(app: FastAPI):
         await update_task
     except asyncio.CancelledError:
         print("Attestation root update task cancelled successfully.")
+    for task in (rollup_task, cleanup_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
-app = FastAPI(title="OSP Backend", version="0.1.0", lifespan=lifespan)
+    # Close the pooled connections to Apple sign-in
+    await apple_auth.close_http_client()
+
+app = FastAPI(
+    title="OSP Backend",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 # Define the list of origins that are allowed to make requests.
 # For development, you often need localhost.
@@ -49,6 +73,10 @@ app.add_middleware(
     allow_headers=["*"],    # Allows all headers.
 )
 
+# Reject oversize uploads from their Content-Length before the body is received
+app.add_middleware(RequestSizeLimitMiddleware)
+app.add_middleware(DBSessionMiddleware)
+
 # Include routers
 app.include_router(auth_router, prefix="/api/v1/auth")
 app.include_router(media_router, prefix="/api/v1")
@@ -2,6 +2,9 @@ from typing import Dict, Any
 import logging
 from fastapi import Request, Depends, HTTPException, status, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
 
 from app.security.jwt import decode_token
 from app.services.user_service import UserService
@@ -55,7 +58,8 @@ class JWTBearer(HTTPBearer):
             )
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Security(JWTBearer())
+    credentials: HTTPAuthorizationCredentials = Security(JWTBearer()),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     Dependency that extracts and validates the JWT from the Authorization header,
@@ -103,27 +107,27 @@ async def get_current_user(
                 detail={"error": "INVALID_TOKEN", "message": "Invalid token: missing user ID"}
             )
 
-        # Verify user still exists in database
-        with UserService() as user_service:
-            user = user_service.find_user_by_provider_id(
-                provider=payload.get('provider'),
-                provider_id=user_id
+        # Verify user still exists in database (shares the request's session with the endpoint)
+        user_service = UserService(db)
+        user = await user_service.find_user_by_provider_id(
+            provider=payload.get('provider'),
+            provider_id=user_id
+        )
+        if not user or not user.is_active:
+            logger.warning(f'User not found or inactive for token userId: {user_id}')
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail={"error": "INVALID_TOKEN", "message": "User associated with token does not exist or is inactive"}
             )
-            if not user or not user.is_active:
-                logger.warning(f'User not found or inactive for token userId: {user_id}')
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail={"error": "INVALID_TOKEN", "message": "User associated with token does not exist or is inactive"}
-                )
 
-            user_context = {
-                'userId': user_id,
-                'provider': payload.get('provider'),
-                'roles': payload.get('roles', ['user'])
-            }
-            
-            logger.info(f'Successfully authenticated user {user_id} for {credentials.scheme} request')
-            return user_context
+        user_context = {
+            'userId': user_id,
+            'provider': payload.get('provider'),
+            'roles': payload.get('roles', ['user'])
+        }
+        
+        logger.info(f'Successfully authenticated user {user_id} for {credentials.scheme} request')
+        return user_context
 
     except HTTPException:
         raise
@@ -0,0 +1,30 @@
+import logging
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.db.session import SessionLocal, request_scope
+
+logger = logging.getLogger(__name__)
+
+class DBSessionMiddleware:
+    """
+    ASGI middleware that gives each HTTP request a single database session.
+
+    The session is exposed as ``request.state.db`` and is the one returned by
+    ``SessionLocal()`` anywhere while the request is being handled. It is
+    removed from the registry (and its connection returned to the pool) once
+    the response has been sent.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = request_scope.set(object())
+        try:
+            scope.setdefault("state", {})["db"] = SessionLocal()
+            await self.app(scope, receive, send)
+        finally:
+            SessionLocal.remove()
+            request_scope.reset(token)
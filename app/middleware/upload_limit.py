@@ -0,0 +1,54 @@
+import logging
+from fastapi import HTTPException, status
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_BYTES = settings.MAX_UPLOAD_BYTES
+
+class RequestSizeLimitMiddleware:
+    """
+    ASGI middleware that rejects request bodies larger than ``max_body_size``.
+
+    Requests declaring a larger Content-Length are answered with 413 before any
+    of the body is received. Bodies sent without a Content-Length (chunked) are
+    counted as they stream in and cut off as soon as the limit is exceeded.
+    """
+    def __init__(self, app: ASGIApp, max_body_size: int = MAX_UPLOAD_BYTES):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_size:
+            logger.error(f"File too large: {content_length} bytes")
+            response = ORJSONResponse(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                content={"detail": f"File too large: {content_length} bytes. Maximum allowed is {self.max_body_size} bytes."}
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    logger.error(f"File too large: body exceeded {self.max_body_size} bytes while streaming")
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File too large. Maximum allowed is {self.max_body_size} bytes."
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -2,6 +2,13 @@ from datetime import datetime
 from pydantic import BaseModel, Field, validator, ConfigDict, computed_field
 from typing import Optional
 from app.core.config import settings
+from app.models.media import OrientationVector
+
+# Media files are fetched by clients from here, never through the API
+MEDIA_PUBLIC_BASE_URL = settings.S3_PUBLIC_BASE_URL.rstrip("/")
+
+# Upper bound on one page of GET /media results
+MAX_MEDIA_PAGE_SIZE = 1000
 
 class MediaFilterParams(BaseModel):
     lat: float
@@ -9,6 +16,9 @@ class MediaFilterParams(BaseModel):
     radius: float
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
+    # Optional pagination; without a limit every match is returned
+    limit: Optional[int] = Field(None, gt=0, le=MAX_MEDIA_PAGE_SIZE)
+    offset: int = Field(0, ge=0)
 
     @validator('lat')
     def validate_latitude(cls, v):
@@ -35,11 +45,6 @@ class MediaFilterParams(BaseModel):
             raise ValueError('start_date must be before end_date.')
         return v
 
-class OrientationVector(BaseModel):
-    azimuth: float
-    pitch: float
-    roll: float
-
 # This schema represents the data coming from the SQLAlchemy model
 class Media(BaseModel):
     id: str
@@ -74,7 +79,7 @@ class Media(BaseModel):
         """
         Dynamically constructs the full public URL for the media file.
         """
-        return f"{settings.S3_PUBLIC_BASE_URL}/{self.file_path}"
+        return f"{MEDIA_PUBLIC_BASE_URL}/{self.file_path}"
 
     @computed_field
     @property
@@ -85,11 +90,15 @@ class Media(BaseModel):
         if not self.thumbnail_path:
             return None
         
-        return f"{settings.S3_PUBLIC_BASE_URL}/{self.thumbnail_path}"
+        return f"{MEDIA_PUBLIC_BASE_URL}/{self.thumbnail_path}"
 
     # This tells Pydantic to read data from SQLAlchemy model attributes
     model_config = ConfigDict(from_attributes=True)
 
+class MediaDetail(Media):
+    # pending until the file is in storage, then ready (or failed)
+    upload_status: str
+
 class MediaListResponse(BaseModel):
     count: int
     media: list[Media]
@@ -1,5 +1,6 @@
 import time
 import os
+import uuid
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from jose import jwt
@@ -14,6 +15,12 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 15
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
+# Revoked refresh token IDs (jti claims), mapped to the token's expiry as a
+# Unix timestamp. An entry is only needed until its token expires, so expired
+# ones are pruned on every revocation. The list is per process: a token
+# revoked on one worker is still accepted by the others until it expires.
+_revoked_refresh_jtis: Dict[str, float] = {}
+
 def create_access_token(
     user_id: str,
     provider: str,
@@ -87,6 +94,7 @@ def create_refresh_token(
         "roles": roles,
         "exp": expire,
         "iat": datetime.utcnow(),
+        "jti": uuid.uuid4().hex,
         "type": "refresh"
     }
     
@@ -141,6 +149,11 @@ def verify_refresh_token(token: str) -> Optional[Dict[str, Any]]:
         if decoded_token.get("type") != "refresh":
             logger.warning("Token is not a refresh token")
             return None
+
+        # Ensure it has not been revoked (e.g. by logout)
+        if is_refresh_token_revoked(decoded_token.get("jti")):
+            logger.warning(f"Refresh token has been revoked for user {decoded_token.get('userId')}")
+            return None
             
         logger.info(f"Refresh token verified for user {decoded_token.get('userId')}")
         return decoded_token
@@ -151,4 +164,35 @@ def verify_refresh_token(token: str) -> Optional[Dict[str, Any]]:
         logger.error(f"Unexpected error during refresh token verification: {str(e)}")
         return None
 
+def revoke_refresh_token(jti: Optional[str], expires_at: Optional[float] = None) -> None:
+    """
+    Revoke a refresh token so it can no longer be exchanged for access tokens.
+    
+    Args:
+        jti: The unique token ID claim of the refresh token
+        expires_at: The token's exp claim; the revocation is kept until then.
+            Defaults to the longest refresh token lifetime from now.
+    """
+    if jti:
+        now = time.time()
+        for expired_jti in [j for j, exp in _revoked_refresh_jtis.items() if exp <= now]:
+            del _revoked_refresh_jtis[expired_jti]
+        if expires_at is None:
+            expires_at = now + REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+        _revoked_refresh_jtis[jti] = expires_at
+        logger.info(f"Revoked refresh token {jti}")
+
+
+def is_refresh_token_revoked(jti: Optional[str]) -> bool:
+    """
+    Check whether a refresh token has been revoked.
+    
+    Args:
+        jti: The unique token ID claim of the refresh token
+        
+    Returns:
+        True if the token was revoked, False otherwise
+    """
+    return jti is not None and jti in _revoked_refresh_jtis
+
 # Removed get_current_user function as it's now in app/middleware/auth.py
@@ -2,6 +2,7 @@ import httpx
 import time
 import logging
 from typing import Dict, Optional, Any
+from fastapi import HTTPException
 from jose import jwt, jwk
 from jose.utils import base64url_decode
 from jose.exceptions import JWTError
@@ -13,6 +14,28 @@ logger = logging.getLogger(__name__)
 # Cache for Apple public keys with their expiry
 _apple_keys_cache: Optional[Dict] = None
 _apple_keys_expiry: int = 0
+_apple_keys_fetched_at: int = 0
+_apple_keys_hits: int = 0
+_apple_keys_misses: int = 0
+APPLE_KEYS_TTL_SECONDS = 24 * 3600  # Apple keys rarely rotate
+# Minimum gap between refetches forced by an unknown kid, so tokens with
+# made-up key IDs can't turn every sign-in into a request to Apple
+APPLE_KEYS_MIN_REFRESH_SECONDS = 300
+
+# Client shared by all key fetches so connections to Apple are reused and,
+# over HTTP/2, concurrent fetches are multiplexed on one connection.
+# Closed on application shutdown by close_http_client().
+_apple_http_client = httpx.AsyncClient(
+    http2=True,
+    timeout=5.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+)
+
+async def close_http_client() -> None:
+    """
+    Close the shared HTTP client and its connection pool.
+    """
+    await _apple_http_client.aclose()
 APPLE_KEYS_URL = "https://appleid.apple.com/auth/keys"
 APPLE_ISSUER = "https://appleid.apple.com"
 ALGORITHM = "RS256"
@@ -38,26 +61,33 @@ def _construct_rsa_key(n: str, e: str) -> bytes:
         logger.error(f"Failed to construct RSA key: {exc}")
         raise
 
-async def _fetch_apple_public_keys(client: httpx.AsyncClient) -> Dict:
+async def _fetch_apple_public_keys(force_refresh: bool = False) -> Dict:
     """
-    Fetch Apple's public keys and cache them with a TTL.
+    Return Apple's public keys keyed by kid, fetching them only when the
+    cached copy has expired or a refresh is forced.
     """
-    global _apple_keys_cache, _apple_keys_expiry
+    global _apple_keys_cache, _apple_keys_expiry, _apple_keys_fetched_at
+    global _apple_keys_hits, _apple_keys_misses
 
     current_time = int(time.time())
     if _apple_keys_cache is not None and current_time < _apple_keys_expiry:
-        return _apple_keys_cache
+        throttled = current_time - _apple_keys_fetched_at < APPLE_KEYS_MIN_REFRESH_SECONDS
+        if not force_refresh or throttled:
+            _apple_keys_hits += 1
+            return _apple_keys_cache
 
+    _apple_keys_misses += 1
     try:
-        response = await client.get(APPLE_KEYS_URL)
+        response = await _apple_http_client.get(APPLE_KEYS_URL)
         response.raise_for_status()
         keys = response.json().get("keys", [])
 
-        # Cache for 24 hours (Apple keys rarely rotate)
         _apple_keys_cache = {key["kid"]: key for key in keys}
-        _apple_keys_expiry = current_time + (24 * 3600)
+        _apple_keys_fetched_at = current_time
+        _apple_keys_expiry = current_time + APPLE_KEYS_TTL_SECONDS
 
-        logger.info("Successfully fetched and cached Apple public keys")
+        hit_ratio = _apple_keys_hits / (_apple_keys_hits + _apple_keys_misses)
+        logger.info(f"Successfully fetched and cached Apple public keys (cache hit ratio {hit_ratio:.2%})")
         return _apple_keys_cache
     except Exception as exc:
         logger.error(f"Failed to fetch Apple public keys: {exc}")
@@ -113,11 +143,13 @@ async def verify_apple_id_token(
                 detail="INVALID_TOKEN"
             )
 
-        # Get Apple's public keys
-        async with httpx.AsyncClient() as client:
-            keys = await _fetch_apple_public_keys(client)
-
+        # Get Apple's public keys, refetching once if the kid is unknown
+        # in case Apple has rotated its keys since they were cached
+        keys = await _fetch_apple_public_keys()
         key = keys.get(kid)
+        if not key:
+            keys = await _fetch_apple_public_keys(force_refresh=True)
+            key = keys.get(kid)
         if not key:
             logger.warning(f"Public key not found for kid: {kid}")
             raise HTTPException(
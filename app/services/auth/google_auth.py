@@ -1,9 +1,12 @@
 from fastapi import HTTPException
 from google.oauth2 import id_token
 from google.auth.transport import requests
+from cachecontrol import CacheControl
+from functools import lru_cache
 from typing import Dict, Any
 import logging
 import os
+import requests as http_requests
 
 from google_auth_oauthlib.flow import Flow
 import json
@@ -17,6 +20,21 @@ class GoogleAuth:
         self.client_id = os.getenv('GOOGLE_CLIENT_ID')
         if not self.client_id:
             raise ValueError("GOOGLE_CLIENT_ID environment variable is required")
+        self.redirect_uri = os.getenv("GOOGLE_REDIRECT_URI", "http://localhost:8001")
+        self.client_config = {
+            "web": {
+                "client_id": self.client_id,
+                "client_secret": os.getenv("GOOGLE_CLIENT_SECRET"),
+                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+                "token_uri": "https://oauth2.googleapis.com/token",
+                "redirect_uris": [self.redirect_uri]
+            }
+        }
+        # Transport used to fetch Google's signing certificates, reused across
+        # calls. The session keeps connections alive and honours the
+        # Cache-Control headers Google sends with the certs, so they are only
+        # refetched when they expire rather than on every verification.
+        self._request = requests.Request(session=CacheControl(http_requests.Session()))
     
     def verify_token(self, token: str) -> Dict[str, Any]:
         """
@@ -35,7 +53,7 @@ class GoogleAuth:
             # Verify the token with Google's servers
             id_info = id_token.verify_oauth2_token(
                 token,
-                requests.Request(),
+                self._request,
                 self.client_id
             )
             
@@ -87,20 +105,12 @@ class GoogleAuth:
         try:
             # Configure the OAuth flow
             flow = Flow.from_client_config(
-                {
-                    "web": {
-                        "client_id": os.getenv("GOOGLE_CLIENT_ID"),
-                        "client_secret": os.getenv("GOOGLE_CLIENT_SECRET"),
-                        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                        "token_uri": "https://oauth2.googleapis.com/token",
-                        "redirect_uris": [os.getenv("GOOGLE_REDIRECT_URI", "http://localhost:8001")]
-                    }
-                },
+                self.client_config,
                 scopes=["openid", "email", "profile"]
             )
             
             # Set the redirect URI (must match what was used in the frontend)
-            flow.redirect_uri = os.getenv("GOOGLE_REDIRECT_URI", "http://localhost:8001")
+            flow.redirect_uri = self.redirect_uri
             
             # Exchange the authorization code for tokens
             flow.fetch_token(code=authorization_code)
@@ -111,8 +121,8 @@ class GoogleAuth:
             # Verify the ID token
             idinfo = id_token.verify_oauth2_token(
                 id_token_jwt, 
-                requests.Request(), 
-                os.getenv("GOOGLE_CLIENT_ID")
+                self._request, 
+                self.client_id
             )
             
             # Extract user information
@@ -129,3 +139,14 @@ class GoogleAuth:
                 status_code=401,
                 detail="Invalid Google authorization code"
             )
+
+
+@lru_cache(maxsize=1)
+def get_google_auth() -> GoogleAuth:
+    """
+    Return the process-wide GoogleAuth instance, creating it on first use.
+
+    Created lazily rather than at import so the app can start without
+    GOOGLE_CLIENT_ID configured (e.g. Apple-only deployments and tests).
+    """
+    return GoogleAuth()
@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, DataError, SQLAlchemyError
 
 from app.db.session import SessionLocal
-from app.models.media import Media
+from app.db.models import Media
 from app.services.trust import calculate_trust_score
 
 logger = logging.getLogger(__name__)
@@ -16,13 +16,13 @@ class TrustScoreUpdateError(Exception):
     pass
 
 
-def update_media_trust_score(db: Session, media_id: int, capture_time: datetime, upload_time: datetime) -> bool:
+def update_media_trust_score(db: Session, media_id: str, capture_time: datetime, upload_time: datetime) -> bool:
     """
     Update the trust score for a media record in the database.
     
     Args:
         db (Session): Database session
-        media_id (int): ID of the media record
+        media_id (str): ID of the media record
         capture_time (datetime): When the media was captured
         upload_time (datetime): When the media was uploaded
         
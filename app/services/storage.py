@@ -1,13 +1,17 @@
 # app/services/storage.py
 import os
+from typing import BinaryIO, Dict, List, Union
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 import logging
 
+from app.core.config import settings
+
 logger = logging.getLogger("app.storage")
 
-# Get config from environment variables
-S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
+# Get config from settings and environment variables
+S3_BUCKET_NAME = settings.S3_BUCKET_NAME
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") # This is None in production
 
@@ -22,10 +26,23 @@ if S3_ENDPOINT_URL:
 # Initialize the S3 client with our flexible configuration
 s3_client = boto3.client("s3", **s3_client_config)
 
+# File objects are uploaded in 8MB parts, up to 4 at a time, so memory per
+# upload stays bounded regardless of the file size
+UPLOAD_CHUNK_SIZE_BYTES = 8 * 1024 * 1024
+upload_transfer_config = TransferConfig(
+    multipart_threshold=UPLOAD_CHUNK_SIZE_BYTES,
+    multipart_chunksize=UPLOAD_CHUNK_SIZE_BYTES,
+    max_concurrency=4
+)
+
 
-def save_file(file_data: bytes, filename: str, content_type: str) -> str:
+def save_file(file_data: Union[bytes, BinaryIO], filename: str, content_type: str) -> str:
     """
     Save a file to the configured S3-compatible storage (AWS S3 or MinIO).
+
+    ``file_data`` may be raw bytes or a readable binary file object. File
+    objects are streamed to storage in 8MB chunks (multipart for large
+    files), so the payload never has to be held in memory in full.
     
     Returns:
         The public URL of the saved file.
@@ -35,12 +52,21 @@ def save_file(file_data: bytes, filename: str, content_type: str) -> str:
         raise ValueError("Storage service is not configured.")
 
     try:
-        s3_client.put_object(
-            Bucket=S3_BUCKET_NAME,
-            Key=filename,
-            Body=file_data,
-            ContentType=content_type
-        )
+        if isinstance(file_data, (bytes, bytearray)):
+            s3_client.put_object(
+                Bucket=S3_BUCKET_NAME,
+                Key=filename,
+                Body=file_data,
+                ContentType=content_type
+            )
+        else:
+            s3_client.upload_fileobj(
+                file_data,
+                S3_BUCKET_NAME,
+                filename,
+                ExtraArgs={"ContentType": content_type},
+                Config=upload_transfer_config
+            )
         
         # --- Construct the correct URL based on environment ---
         if S3_ENDPOINT_URL:
@@ -74,3 +100,38 @@ def delete_file(filename: str) -> bool:
     except ClientError as e:
         logger.error(f"Failed to delete file {filename}: {e}")
         return False
+
+
+# S3 accepts at most this many keys per DeleteObjects request
+MAX_KEYS_PER_DELETE = 1000
+
+def delete_files(filenames: List[str]) -> Dict[str, str]:
+    """
+    Delete several files from the S3-compatible storage with as few
+    DeleteObjects requests as possible (one per 1000 keys).
+
+    Returns:
+        The keys that could not be deleted, mapped to the error; empty if
+        every delete succeeded. Keys that did not exist count as deleted.
+    """
+    if not S3_BUCKET_NAME:
+        logger.error("S3_BUCKET_NAME environment variable is not set.")
+        return {filename: "Storage service is not configured." for filename in filenames}
+
+    failed = {}
+    for start in range(0, len(filenames), MAX_KEYS_PER_DELETE):
+        batch = filenames[start:start + MAX_KEYS_PER_DELETE]
+        try:
+            response = s3_client.delete_objects(
+                Bucket=S3_BUCKET_NAME,
+                Delete={"Objects": [{"Key": filename} for filename in batch], "Quiet": True}
+            )
+        except ClientError as e:
+            logger.error(f"Failed to delete {len(batch)} files: {e}")
+            failed.update((filename, str(e)) for filename in batch)
+            continue
+        for error in response.get("Errors", []):
+            logger.error(f"Failed to delete file {error['Key']}: {error.get('Message')}")
+            failed[error["Key"]] = error.get("Message") or error.get("Code", "")
+    logger.info(f"Deleted {len(filenames) - len(failed)} of {len(filenames)} files")
+    return failed
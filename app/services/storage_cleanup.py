@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from sqlalchemy import select
+from app.db.models import StorageDeletion
+from app.db.session import SessionLocal
+from app.services.storage import delete_files
+
+logger = logging.getLogger(__name__)
+
+# Pending deletions claimed per pass, and how often the queue is polled
+STORAGE_CLEANUP_BATCH_SIZE = 100
+STORAGE_CLEANUP_INTERVAL_SECONDS = 30
+# Deletions that keep failing are left for an operator after this many tries
+STORAGE_CLEANUP_MAX_ATTEMPTS = 10
+
+def process_pending_deletions(session, batch_size: int = STORAGE_CLEANUP_BATCH_SIZE) -> int:
+    """
+    Delete one batch of queued storage objects and record the outcome.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED, so several workers can
+    drain the queue without deleting the same object twice, and the whole
+    batch is deleted with a single DeleteObjects request. Deleting an
+    object that is already gone succeeds, so a retry after a crash is
+    harmless.
+
+    Returns:
+        The number of objects deleted.
+    """
+    stmt = (
+        select(StorageDeletion)
+        .where(
+            StorageDeletion.done_at.is_(None),
+            StorageDeletion.attempts < STORAGE_CLEANUP_MAX_ATTEMPTS
+        )
+        .order_by(StorageDeletion.enqueued_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    done = 0
+    try:
+        deletions = session.execute(stmt).scalars().all()
+        if not deletions:
+            session.rollback()
+            return 0
+        try:
+            failed = delete_files(list({deletion.path for deletion in deletions}))
+        except Exception as e:
+            failed = {deletion.path: str(e) for deletion in deletions}
+
+        now = datetime.now(timezone.utc)
+        for deletion in deletions:
+            deletion.attempts += 1
+            if deletion.path in failed:
+                deletion.last_error = failed[deletion.path]
+                logger.warning("Failed to delete %s from storage (attempt %s): %s",
+                               deletion.path, deletion.attempts, deletion.last_error)
+            else:
+                deletion.done_at = now
+                done += 1
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    return done
+
+def _drain_queue() -> None:
+    """Process batches until one deletes less than a full batch."""
+    with SessionLocal.session_factory() as session:
+        while process_pending_deletions(session) == STORAGE_CLEANUP_BATCH_SIZE:
+            pass
+
+async def periodic_storage_cleanup_task():
+    """A background task that runs forever, deleting queued storage objects."""
+    while True:
+        try:
+            await asyncio.to_thread(_drain_queue)
+        except Exception as e:
+            logger.error("Storage cleanup pass failed: %s", e)
+        await asyncio.sleep(STORAGE_CLEANUP_INTERVAL_SECONDS)
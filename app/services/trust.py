@@ -1,13 +1,19 @@
 from datetime import datetime
+import asyncio
 import logging
+from app.db.models import MediaTrustDaily
+from app.db.session import async_engine
 
 logger = logging.getLogger(__name__)
 
+# How often the media_trust_daily rollup is recomputed
+TRUST_ROLLUP_REFRESH_SECONDS = 5 * 60
+
 def calculate_trust_score(capture_time: datetime, upload_time: datetime) -> int:
     """
     Calculate the trust score based on the time difference between capture and upload.
 
-    Formula: max(0, 100 - (upload_time - capture_time).total_seconds() / 60)
+    Formula: max(0, min(100, int(100 - (upload_time - capture_time).total_seconds() / 60)))
     The score decreases by 1 point per minute, starting from 100.
 
     Args:
@@ -18,24 +24,39 @@ def calculate_trust_score(capture_time: datetime, upload_time: datetime) -> int:
         int: Calculated trust score (0 to 100), or 0 if inputs are invalid.
     """
     # Validate inputs
+    if capture_time is None or upload_time is None:
+        logger.warning("Timestamp is None: capture_time=%s, upload_time=%s", capture_time, upload_time)
+        return 0
+
     if not isinstance(capture_time, datetime) or not isinstance(upload_time, datetime):
         logger.warning("Invalid timestamp type: capture_time=%s (%s), upload_time=%s (%s)",
                       capture_time, type(capture_time).__name__,
                       upload_time, type(upload_time).__name__)
         return 0
 
-    if capture_time is None or upload_time is None:
-        logger.warning("Timestamp is None: capture_time=%s, upload_time=%s", capture_time, upload_time)
+    try:
+        time_diff_seconds = (upload_time - capture_time).total_seconds()
+    except Exception as e:
+        logger.warning("Error calculating trust score: %s", e)
         return 0
 
-    if capture_time > upload_time:
+    if time_diff_seconds < 0:
         logger.warning("Capture time is after upload time: %s > %s", capture_time, upload_time)
         return 0
 
+    # Single clamp to [0, 100]; int() rounds down
+    return max(0, min(100, int(100 - time_diff_seconds / 60)))
+
+async def refresh_trust_rollups() -> None:
+    """Refresh the media_trust_daily view, logging rather than raising on failure."""
     try:
-        time_diff_seconds = (upload_time - capture_time).total_seconds()
-        score = max(0, 100 - time_diff_seconds / 60)
-        return int(score)  # Round down
+        async with async_engine.begin() as connection:
+            await MediaTrustDaily.refresh(connection)
     except Exception as e:
-        logger.warning("Error calculating trust score: %s", e)
-        return 0
+        logger.error("Failed to refresh media_trust_daily: %s", e)
+
+async def periodic_trust_rollup_refresh_task():
+    """A background task that runs forever, refreshing the trust rollups periodically."""
+    while True:
+        await refresh_trust_rollups()
+        await asyncio.sleep(TRUST_ROLLUP_REFRESH_SECONDS)
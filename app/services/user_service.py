@@ -1,23 +1,62 @@
-from typing import Optional, Dict, Any
-from sqlalchemy.orm import Session
+from typing import Optional, Dict, Any, List, NamedTuple
+from cachetools import TTLCache
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models import User
-from app.db.base import SessionLocal
+from app.db.base import AsyncSessionLocal
 import logging
 
 logger = logging.getLogger(__name__)
 
+class CachedUser(NamedTuple):
+    """Minimal, immutable snapshot of a User row kept in the lookup cache."""
+    id: int
+    provider: str
+    provider_id: str
+    email: Optional[str]
+    is_active: bool
+
+# Lookup caches shared by all UserService instances in this process
+USER_CACHE_MAXSIZE = 10_000
+USER_CACHE_TTL_SECONDS = 300
+_users_by_provider_id: TTLCache = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_CACHE_TTL_SECONDS)
+_users_by_email: TTLCache = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+def _cache_user(user: User) -> CachedUser:
+    """Store a snapshot of the user in both lookup caches and return it."""
+    cached = CachedUser(
+        id=user.id,
+        provider=user.provider,
+        provider_id=user.provider_id,
+        email=user.email,
+        is_active=user.is_active
+    )
+    _users_by_provider_id[(cached.provider, cached.provider_id)] = cached
+    if cached.email:
+        _users_by_email[cached.email] = cached
+    return cached
+
+def _invalidate_user(user) -> None:
+    """Drop any cached snapshot of the user from both lookup caches."""
+    _users_by_provider_id.pop((user.provider, user.provider_id), None)
+    if user.email:
+        _users_by_email.pop(user.email, None)
+
 class UserService:
     """Service for handling user-related operations in the database."""
 
-    def __init__(self, db: Optional[Session] = None):
+    def __init__(self, db: Optional[AsyncSession] = None):
         """Initialize the UserService with an optional database session.
 
         Args:
-            db: Optional SQLAlchemy database session. If not provided, a new session will be created.
+            db: Optional SQLAlchemy async database session. If not provided, a new session will be created.
         """
-        self.db = db or SessionLocal()
+        self.db = db or AsyncSessionLocal()
+        # Users written in the current transaction, cached once it commits
+        self._pending_cache: List[User] = []
 
-    def find_user_by_provider_id(self, provider: str, provider_id: str) -> Optional[User]:
+    async def find_user_by_provider_id(self, provider: str, provider_id: str) -> Optional[CachedUser]:
         """Find a user by their provider and provider ID.
 
         Args:
@@ -25,20 +64,34 @@ class UserService:
             provider_id: The unique ID from the authentication provider.
 
         Returns:
-            The User object if found, None otherwise.
+            A cached snapshot of the user if found, None otherwise.
         """
+        cached = _users_by_provider_id.get((provider, provider_id))
+        if cached is not None:
+            return cached
         try:
-            user = self.db.query(User).filter(
-                User.provider == provider,
-                User.provider_id == provider_id
-            ).first()
-            return user
+            result = await self.db.execute(
+                select(User).where(
+                    User.provider == provider,
+                    User.provider_id == provider_id
+                )
+            )
+            user = result.scalars().first()
+            return _cache_user(user) if user else None
         except Exception as e:
             logger.error(f"Error finding user by provider ID: {e}")
             raise
 
-    def create_user(self, user_data: Dict[str, Any]) -> User:
-        """Create a new user in the database.
+    async def create_user(self, user_data: Dict[str, Any]) -> Optional[User]:
+        """Create a new user in the database, or return the existing one.
+
+        Issued as a single INSERT ... ON CONFLICT (provider, provider_id)
+        DO UPDATE ... WHERE users.is_active RETURNING, so an account created
+        concurrently for the same provider ID is returned rather than
+        duplicated. The insert runs in a savepoint, so a conflict on another
+        unique column (e.g. the email belongs to a different account) raises
+        IntegrityError without aborting the surrounding transaction. The
+        caller is responsible for calling commit().
 
         Args:
             user_data: Dictionary containing user data including:
@@ -49,92 +102,154 @@ class UserService:
                 - full_name: User's full name (optional)
 
         Returns:
-            The newly created User object.
-        """
-        try:
-            # Ensure required fields are present
-            required_fields = ['provider', 'provider_id', 'email']
-            for field in required_fields:
-                if field not in user_data:
-                    raise ValueError(f"Missing required field: {field}")
-
-            # Create the user
-            db_user = User(
-                provider=user_data['provider'],
-                provider_id=user_data['provider_id'],
-                email=user_data['email'],
-                username=user_data.get('username'),
-                full_name=user_data.get('full_name'),
-                is_verified=True if user_data['provider'] in ['google', 'apple'] else False,
-                is_active=True
-            )
+            The new or existing User object, or None if an account with this
+            provider ID exists but is inactive.
 
-            self.db.add(db_user)
-            self.db.commit()
-            self.db.refresh(db_user)
-
-            logger.info(f"Created new user with provider ID: {user_data['provider_id']}")
-            return db_user
+        Raises:
+            ValueError: If a required field is missing
+            IntegrityError: If the email or username belongs to another account
+        """
+        # Ensure required fields are present
+        required_fields = ['provider', 'provider_id', 'email']
+        for field in required_fields:
+            if field not in user_data:
+                raise ValueError(f"Missing required field: {field}")
+
+        stmt = insert(User).values(
+            provider=user_data['provider'],
+            provider_id=user_data['provider_id'],
+            email=user_data['email'],
+            username=user_data.get('username'),
+            full_name=user_data.get('full_name'),
+            is_verified=True if user_data['provider'] in ['google', 'apple'] else False,
+            is_active=True
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.provider, User.provider_id],
+            set_={'email': stmt.excluded.email},
+            where=User.is_active
+        ).returning(User)
 
+        try:
+            async with self.db.begin_nested():
+                result = await self.db.execute(stmt)
+            db_user = result.scalars().first()
         except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error creating user: {e}")
+            logger.warning(f"Could not create user with provider ID {user_data['provider_id']}: {e}")
             raise
 
-    def find_user_by_email(self, email: str) -> Optional[User]:
+        if db_user:
+            logger.info(f"Created or found user with provider ID: {user_data['provider_id']}")
+            self._pending_cache.append(db_user)
+        return db_user
+
+    async def find_user_by_email(self, email: str) -> Optional[CachedUser]:
         """Find a user by their email address.
 
         Args:
             email: The user's email address.
 
         Returns:
-            The User object if found, None otherwise.
+            A cached snapshot of the user if found, None otherwise.
         """
         try:
             if not email:
                 return None
-            user = self.db.query(User).filter(User.email == email).first()
-            return user
+            cached = _users_by_email.get(email)
+            if cached is not None:
+                return cached
+            result = await self.db.execute(select(User).where(User.email == email))
+            user = result.scalars().first()
+            return _cache_user(user) if user else None
         except Exception as e:
             logger.error(f"Error finding user by email '{email}': {e}")
             raise
 
-    def delete_user(self, user_id: int) -> User:
+    async def update_provider_id(self, user: CachedUser, provider_id: str) -> User:
+        """Replace the provider ID stored for a user (e.g. after a device reset).
+
+        Issues a single UPDATE ... RETURNING. The caller is responsible for
+        calling commit().
+
+        Args:
+            user: The user to update, as returned by one of the lookups.
+            provider_id: The new unique ID from the authentication provider.
+
+        Returns:
+            The updated User object.
+
+        Raises:
+            ValueError: If the user no longer exists
+        """
+        try:
+            _invalidate_user(user)
+            result = await self.db.execute(
+                update(User)
+                .where(User.id == user.id)
+                .values(provider_id=provider_id)
+                .returning(User)
+            )
+            updated_user = result.scalars().first()
+            if not updated_user:
+                raise ValueError(f"User with id {user.id} not found")
+            self._pending_cache.append(updated_user)
+            return updated_user
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error updating provider ID for user {user.id}: {str(e)}")
+            raise
+
+    async def commit(self) -> None:
+        """Commit pending writes and cache the users written in this transaction."""
+        if not self._pending_cache:
+            return
+        try:
+            await self.db.commit()
+        except Exception:
+            self._pending_cache.clear()
+            await self.db.rollback()
+            raise
+        for user in self._pending_cache:
+            _cache_user(user)
+        self._pending_cache.clear()
+
+    async def delete_user(self, user_id: int) -> User:
         """Soft delete a user by deactivating their account.
-        
+
         Args:
             user_id: The unique ID of the user to delete.
-            
+
         Returns:
             The updated User object with is_active=False
-        
+
         Raises:
             ValueError: If user with the given ID is not found
             Exception: For database errors during operation
         """
         try:
-            user = self.db.query(User).filter(User.id == user_id).first()
+            user = await self.db.get(User, user_id)
             if not user:
                 raise ValueError(f"User with id {user_id} not found")
+            _invalidate_user(user)
             user.is_active = False
-            self.db.commit()
-            self.db.refresh(user)
+            await self.db.commit()
+            await self.db.refresh(user)
             logger.info(f"User account deleted (deactivated): {user_id}")
             return user
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Error deleting user account {user_id}: {str(e)}")
             raise
-    
-    def close(self):
+
+    async def close(self):
         """Close the database session if it was created internally."""
         if self.db and not hasattr(self.db, 'external'):
-            self.db.close()
+            await self.db.close()
 
-    def __enter__(self):
-        """Support for context manager protocol."""
+    async def __aenter__(self):
+        """Support for async context manager protocol."""
         return self
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Ensure the session is closed when exiting the context."""
-        self.close()
+        await self.close()
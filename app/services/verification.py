@@ -1,11 +1,11 @@
 # app/services/verification.py
 
 import hashlib
+import hmac
 import os
 import asyncio
 import json
 from typing import NamedTuple, Optional, List
-from fastapi import UploadFile
 
 # --- Cryptography & Validation Imports ---
 import httpx
@@ -101,15 +101,8 @@ def hash_chunk(data: bytes) -> bytes:
 def hash_pair(left: bytes, right: bytes) -> bytes:
     return hashlib.sha256(left + right).digest()
 
-async def calculate_merkle_root(file: UploadFile) -> bytes:
-    await file.seek(0)
-    leaf_hashes = []
-    while True:
-        chunk = await file.read(CHUNK_SIZE_BYTES)
-        if not chunk:
-            break
-        leaf_hashes.append(hash_chunk(chunk))
-    await file.seek(0)
+def merkle_root(leaf_hashes: List[bytes]) -> bytes:
+    """Fold the leaf hashes of 1 MB chunks into their Merkle root."""
     if not leaf_hashes: return hashlib.sha256().digest()
     if len(leaf_hashes) == 1: return leaf_hashes[0]
     current_level = leaf_hashes
@@ -122,6 +115,31 @@ async def calculate_merkle_root(file: UploadFile) -> bytes:
         current_level = next_level
     return current_level[0]
 
+class MediaHasher:
+    """
+    Computes the server-side media hash incrementally, as the upload is read.
+
+    Videos are hashed as a Merkle tree over 1 MB chunks, everything else as
+    a plain SHA-256, matching what clients sign. Feed it consecutive chunks
+    of CHUNK_SIZE_BYTES (only the last may be shorter), e.g. while the
+    upload is copied elsewhere, so the file is read only once.
+    """
+    def __init__(self, content_type: Optional[str]):
+        self._merkle = content_type == "video/mp4"
+        self._leaf_hashes: List[bytes] = []
+        self._sha256 = hashlib.sha256()
+
+    def update(self, chunk: bytes) -> None:
+        if self._merkle:
+            self._leaf_hashes.append(hash_chunk(chunk))
+        else:
+            self._sha256.update(chunk)
+
+    def digest(self) -> bytes:
+        if self._merkle:
+            return merkle_root(self._leaf_hashes)
+        return self._sha256.digest()
+
 # --- Verification Logic ---
 
 class VerificationResult(NamedTuple):
@@ -202,7 +220,7 @@ async def _verify_attestation(cert_chain_der: List[bytes], expected_challenge: b
 
 
 async def verify_signature(
-    file: UploadFile,
+    server_media_hash: bytes,
     metadata_str: str,
     client_media_hash_hex: str,
     client_metadata_hash_hex: str,
@@ -213,21 +231,18 @@ async def verify_signature(
     """
     Performs a full cryptographic verification of the uploaded media, metadata,
     and optionally the hardware attestation chain.
+
+    ``server_media_hash`` is the hash of the uploaded media computed by the
+    server (see MediaHasher), so the upload need not be read again here.
     """
     try:
-        # Steps 1 & 2 (Hash calculation and comparison) remain the same
-        if file.content_type == "video/mp4":
-            server_media_hash = await calculate_merkle_root(file)
-        else:
-            server_media_hash = hashlib.sha256(await file.read()).digest()
-            await file.seek(0)
-
+        # Steps 1 & 2 (Hash calculation and comparison)
         server_metadata_hash = hashlib.sha256(metadata_str.encode('utf-8')).digest()
 
-        if server_media_hash != bytes.fromhex(client_media_hash_hex):
+        if not hmac.compare_digest(server_media_hash, bytes.fromhex(client_media_hash_hex)):
             logger.warning(f"Media hash mismatch. Client: {client_media_hash_hex}, Server: {server_media_hash.hex()}")
             return VerificationResult(False, "MEDIA_HASH_MISMATCH")
-        if server_metadata_hash != bytes.fromhex(client_metadata_hash_hex):
+        if not hmac.compare_digest(server_metadata_hash, bytes.fromhex(client_metadata_hash_hex)):
             logger.warning(f"Metadata hash mismatch. Client: {client_metadata_hash_hex}, Server: {server_metadata_hash.hex()}")
             return VerificationResult(False, "METADATA_HASH_MISMATCH")
 
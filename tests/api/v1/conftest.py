@@ -1,3 +1,4 @@
+import pytest
 import logging
 from unittest.mock import Mock
 from _pytest.logging import LogCaptureHandler
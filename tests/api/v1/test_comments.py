@@ -144,7 +144,7 @@ def test_get_comments_success(mock_db_session, mock_get_current_user):
     mock_comment.user_id = "user_123"
     mock_comment.created_at = "2023-01-01T00:00:00"
     
-    mock_db_session.query.return_value.filter.return_value.all.return_value = [mock_comment]
+    mock_db_session.execute.return_value.mappings.return_value.all.return_value = [mock_comment]
     
     response = client.get(f"/api/v1/comments/{media_id}")
     
@@ -167,7 +167,7 @@ def test_get_comments_non_existent_media(mock_db_session, mock_get_current_user)
     
     media_id = "invalid"
     
-    mock_db_session.query.return_value.filter.return_value.all.return_value = []
+    mock_db_session.execute.return_value.mappings.return_value.all.return_value = []
     
     response = client.get(f"/api/v1/comments/{media_id}")
     
@@ -5,6 +5,8 @@ from unittest.mock import patch, MagicMock
 
 from app.main import app
 from app.db.models.media import Media
+from app.db.session import get_db
+from app.schemas.media import MEDIA_PUBLIC_BASE_URL
 
 client = TestClient(app)
 
@@ -18,28 +20,50 @@ def override_dependency():
     yield
     app.dependency_overrides.pop(get_current_user)
 
-def test_get_media_valid_geofence_and_time_range(capture_log_records):
+@pytest.fixture(autouse=True)
+def clear_media_query_cache():
+    from app.api.v1.endpoints import media as media_endpoints
+    media_endpoints._media_query_cache.clear()
+    yield
+    media_endpoints._media_query_cache.clear()
+
+@pytest.fixture
+def mock_db_rows():
+    """Override get_db with a session whose queries return the given rows."""
+    db_session = MagicMock()
+    app.dependency_overrides[get_db] = lambda: db_session
+
+    def set_rows(rows):
+        db_session.execute.return_value.mappings.return_value = rows
+
+    yield set_rows
+    app.dependency_overrides.pop(get_db)
+
+def test_get_media_valid_geofence_and_time_range(capture_log_records, mock_db_rows):
     """
     Test valid geofence and time range returns 200 OK with expected media list.
     """
     # Reset log records
     capture_log_records.clear()
 
-    # Mock Media.filter() and return value
-    mock_query = MagicMock()
-    mock_query.all.return_value = [
-        MagicMock(
-            id=1,
-            capture_time=datetime.now(timezone.utc),
-            lat=37.7749,
-            lng=-122.4194,
-            orientation=0,
-            trust_score=95,
-            user_id="user_123",
-            file_path="/test/path/file.jpg"
-        )
-    ]
-    with patch("app.api.v1.endpoints.media.Media.filter", return_value=mock_query):
+    # Mock the projected rows returned for the Media.filter() statement
+    mock_db_rows([
+        {
+            "id": "1",
+            "capture_time": datetime.now(timezone.utc),
+            "lat": 37.7749,
+            "lng": -122.4194,
+            "orientation_azimuth": 0.0,
+            "orientation_pitch": 0.0,
+            "orientation_roll": 0.0,
+            "trust_score": 95,
+            "user_id": "user_123",
+            "file_path": "media-local/test/path/file.jpg",
+            "thumbnail_path": None,
+            "verification_status": "VERIFIED"
+        }
+    ])
+    with patch("app.api.v1.endpoints.media.Media.filter", return_value=MagicMock()):
         start_date = datetime(2023, 1, 1, tzinfo=timezone.utc).isoformat()
         end_date = datetime(2023, 12, 31, tzinfo=timezone.utc).isoformat()
         response = client.get(
@@ -58,8 +82,10 @@ def test_get_media_valid_geofence_and_time_range(capture_log_records):
     data = response.json()
     assert data["count"] == 1
     assert len(data["media"]) == 1
-    assert data["media"][0]["id"] == 1
+    assert data["media"][0]["id"] == "1"
     assert data["media"][0]["trust_score"] == 95
+    assert data["media"][0]["image_url"] == f"{MEDIA_PUBLIC_BASE_URL}/media-local/test/path/file.jpg"
+    assert data["media"][0]["thumbnail_url"] is None
 
     # Verify correct log messages
     logs = [record.msg for record in capture_log_records]
@@ -118,14 +144,13 @@ def test_get_media_start_date_after_end_date():
     assert response.status_code == 422
     assert any("start_date must be before end_date" in err["msg"] for err in response.json()["detail"])
 
-def test_get_media_missing_optional_parameters(capture_log_records):
+def test_get_media_missing_optional_parameters(capture_log_records, mock_db_rows):
     """
     Test that optional parameters (start_date, end_date) can be omitted.
     """
     capture_log_records.clear()
-    mock_query = MagicMock()
-    mock_query.all.return_value = []
-    with patch("app.api.v1.endpoints.media.Media.filter", return_value=mock_query):
+    mock_db_rows([])
+    with patch("app.api.v1.endpoints.media.Media.filter", return_value=MagicMock()):
         response = client.get(
             "/api/v1/media",
             params={
@@ -145,6 +170,31 @@ def test_get_media_missing_optional_parameters(capture_log_records):
     logs = [record.msg for record in capture_log_records]
     assert any("requesting media with filters" in msg for msg in logs)
 
+def test_get_media_passes_pagination_to_filter(mock_db_rows):
+    """
+    Test that limit/offset are forwarded to Media.filter().
+    """
+    mock_db_rows([])
+    with patch("app.api.v1.endpoints.media.Media.filter", return_value=MagicMock()) as mock_filter:
+        response = client.get(
+            "/api/v1/media",
+            params={"lat": 37.7749, "lng": -122.4194, "radius": 1000, "limit": 20, "offset": 40}
+        )
+
+    assert response.status_code == 200
+    assert mock_filter.call_args.kwargs["limit"] == 20
+    assert mock_filter.call_args.kwargs["offset"] == 40
+
+def test_get_media_limit_too_large():
+    """
+    Test a limit above the maximum page size returns 422.
+    """
+    response = client.get(
+        "/api/v1/media",
+        params={"lat": 37.7749, "lng": -122.4194, "radius": 1000, "limit": 100000}
+    )
+    assert response.status_code == 422
+
 def test_get_media_database_error(capture_log_records):
     """
     Test database error (mock Media.filter() to raise exception) returns 500.
@@ -172,6 +222,77 @@ def test_get_media_database_error(capture_log_records):
     assert len(error_logs) >= 1
     assert any("Failed to retrieve media records" in record.msg for record in error_logs)
 
+def test_get_media_by_id_returns_pending_upload(mock_db_rows):
+    """
+    Test that a media item whose upload is still pending can be polled by id.
+    """
+    row = {
+        "id": "1",
+        "capture_time": datetime.now(timezone.utc),
+        "lat": 37.7749,
+        "lng": -122.4194,
+        "orientation_azimuth": 0.0,
+        "orientation_pitch": 0.0,
+        "orientation_roll": 0.0,
+        "trust_score": 95,
+        "user_id": "user_123",
+        "file_path": "media-local/file.jpg",
+        "thumbnail_path": None,
+        "verification_status": "VERIFIED",
+        "upload_status": "pending"
+    }
+    with patch("app.api.v1.endpoints.media.Media.find", return_value=row) as mock_find:
+        response = client.get("/api/v1/media/1")
+
+    assert response.status_code == 200
+    assert response.json()["id"] == "1"
+    assert response.json()["upload_status"] == "pending"
+    assert mock_find.call_args.kwargs["media_id"] == "1"
+
+def test_get_media_by_id_not_found(mock_db_rows):
+    """
+    Test that an unknown media id returns 404.
+    """
+    with patch("app.api.v1.endpoints.media.Media.find", return_value=None):
+        response = client.get("/api/v1/media/missing")
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Media not found"
+
+def test_persist_upload_marks_media_ready():
+    """
+    Test that a stored upload marks its pending record ready, with its thumbnail.
+    """
+    from app.api.v1.endpoints import media as media_endpoints
+    from app.db.models.enums import MediaUploadStatus
+
+    db = MagicMock()
+    processor = MagicMock(return_value=media_endpoints.ProcessedUpload(thumbnail_key="media-local/a_thumb.jpg"))
+    with patch.dict(media_endpoints.UPLOAD_PROCESSORS, {"video/mp4": processor}), \
+            patch("app.api.v1.endpoints.media.Media.finish_upload") as finish_upload:
+        media_endpoints._persist_upload("/tmp/upload.mp4", "a", "a.mp4", "video/mp4", "1", db)
+
+    processor.assert_called_once_with("/tmp/upload.mp4", "a", "a.mp4")
+    finish_upload.assert_called_once_with(
+        db, "1", MediaUploadStatus.READY, thumbnail_path="media-local/a_thumb.jpg"
+    )
+
+def test_persist_upload_marks_media_failed_instead_of_deleting():
+    """
+    Test that a storage failure marks the pending record failed and keeps it.
+    """
+    from app.api.v1.endpoints import media as media_endpoints
+    from app.db.models.enums import MediaUploadStatus
+
+    db = MagicMock()
+    processor = MagicMock(side_effect=Exception("S3 unavailable"))
+    with patch.dict(media_endpoints.UPLOAD_PROCESSORS, {"image/jpeg": processor}), \
+            patch("app.api.v1.endpoints.media.Media.finish_upload") as finish_upload:
+        media_endpoints._persist_upload("/tmp/upload.jpg", "a", "a.jpg", "image/jpeg", "1", db)
+
+    finish_upload.assert_called_once_with(db, "1", MediaUploadStatus.FAILED)
+    db.execute.assert_not_called()
+
 def test_get_media_authenticated_user_context():
     """
     Ensure that authenticated user context is properly passed and checked.
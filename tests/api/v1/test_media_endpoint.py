@@ -8,6 +8,7 @@ from fastapi import HTTPException
 
 from app.main import app
 from app.db.models import Media
+from app.db.session import get_db
 
 client = TestClient(app)
 
@@ -21,10 +22,10 @@ def test_logger():
 # Mock database session
 @pytest.fixture
 def mock_db_session():
-    with patch("app.api.v1.endpoints.media.SessionLocal") as mock:
-        session = MagicMock(spec=Session)
-        mock.return_value = session
-        yield session
+    session = MagicMock(spec=Session)
+    app.dependency_overrides[get_db] = lambda: session
+    yield session
+    app.dependency_overrides.pop(get_db)
 
 # Mock Media.filter behavior
 @pytest.fixture(autouse=True)
@@ -4,7 +4,7 @@ from datetime import datetime, timezone, timedelta
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 from app.main import app
-from app.db.models import Media
+from app.db.models import Media, StorageDeletion
 from app.core.logging import logger
 import logging
 
@@ -69,7 +69,7 @@ class TestMediaUpload:
         response = authenticated_client.post("/api/v1/media", files=files, data=data)
 
         # Assertions
-        assert response.status_code == 201
+        assert response.status_code == 202
         assert "id" in response.json()
         assert response.json()["lat"] == 40.7128
         assert response.json()["lng"] == -74.0060
@@ -211,7 +211,7 @@ class TestMediaUpload:
 
                 response = authenticated_client.post("/api/v1/media", files=files, data=data)
 
-                assert response.status_code == 201
+                assert response.status_code == 202
                 assert response.json()["trust_score"] == expected_score
 
     def test_filename_uuid_and_extension(self, authenticated_client, mock_storage_save, mock_media_create, caplog):
@@ -273,7 +273,7 @@ class TestMediaUpload:
         }
 
         response = authenticated_client.post("/api/v1/media", files=files, data=data)
-        assert response.status_code == 201
+        assert response.status_code == 202
         media_id = response.json()["id"]
         file_path = response.json()["file_path"]
 
@@ -287,8 +287,9 @@ class TestMediaUpload:
         # Check database state
         assert Media.query.get(media_id) is None
 
-        # Check filesystem state
-        mock_storage_delete.assert_called_once_with(file_path)
+        # Storage is cleaned up afterwards by the outbox worker, not in the request
+        mock_storage_delete.assert_not_called()
+        assert StorageDeletion.query.filter_by(path=file_path, done_at=None).count() == 1
 
     def test_deletion_empty_file_path(self, authenticated_client, mock_storage_save, mock_media_create, mock_storage_delete):
         # Mock Media.create to return empty file_path
@@ -312,7 +313,7 @@ class TestMediaUpload:
             "lng": -74.0060
         }
         response = authenticated_client.post("/api/v1/media", files=files, data=data)
-        assert response.status_code == 201
+        assert response.status_code == 202
         media_id = response.json()["id"]
 
         # Delete media
@@ -340,7 +341,7 @@ class TestMediaUpload:
                 "lng": -74.0060
             }
             response = client.post("/api/v1/media", files=files, data=data)
-            assert response.status_code == 201
+            assert response.status_code == 202
             media_id = response.json()["id"]
 
         # Try deleting as user 2
@@ -358,15 +359,15 @@ class TestMediaUpload:
             "lng": -74.0060
         }
         response = authenticated_client.post("/api/v1/media", files=files, data=data)
-        assert response.status_code == 201
+        assert response.status_code == 202
         media_id = response.json()["id"]
         file_path = response.json()["file_path"]
 
-        # Mock storage delete to fail
-        with patch("app.api.v1.endpoints.media.delete_file", side_effect=Exception("Storage error")):
+        # Storage is not called while deleting, so its failure cannot fail the request
+        with patch("app.services.storage_cleanup.delete_files", side_effect=Exception("Storage error")):
             response = authenticated_client.delete(f"/api/v1/media/{media_id}")
-            assert response.status_code == 500
-            assert "internal server error" in response.json()["detail"].lower()
+            assert response.status_code == 204
 
-        # Check database state remains
-        assert Media.query.get(media_id) is not None
+        # The record is gone and its file is queued for retry
+        assert Media.query.get(media_id) is None
+        assert StorageDeletion.query.filter_by(path=file_path, done_at=None).count() == 1
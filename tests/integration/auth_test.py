@@ -1,14 +1,14 @@
 import pytest
 import time
 import logging
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime, timedelta
 from jose import jwt as pyjwt
 from jose import JWTError
 import httpx
 from app.main import app
-from app.security.jwt import create_access_token, create_refresh_token, SECRET_KEY, ALGORITHM
-from app.db.session import get_db
+from app.security.jwt import create_access_token, create_refresh_token, revoke_refresh_token, is_refresh_token_revoked, SECRET_KEY, ALGORITHM
+from app.db.session import get_async_db
 from app.services.user_service import UserService
 
 # Create a test client
@@ -88,18 +88,18 @@ async def test_valid_token_is_accepted(valid_access_token, caplog):
     
     # Patch UserService.find_user_by_provider_id to return a mock user
     with patch('app.middleware.auth.UserService') as mock_user_service:
-        mock_instance = MagicMock()
+        mock_instance = AsyncMock()
         mock_instance.find_user_by_provider_id.return_value = MagicMock(
             id=TEST_USER_ID,
             is_deleted=False
         )
-        mock_user_service.return_value.__enter__.return_value = mock_instance
+        mock_user_service.return_value = mock_instance
         
         # Mock dependency to bypass DB check
         def mock_get_db():
             return MagicMock()
         
-        app.dependency_overrides[get_db] = mock_get_db
+        app.dependency_overrides[get_async_db] = mock_get_db
         
         try:
             with caplog.at_level(logging.INFO):
@@ -156,12 +156,12 @@ async def test_valid_refresh_token_returns_new_access_token(valid_refresh_token,
     
     # Patch the UserService to simulate existing user
     with patch('app.api.v1.endpoints.auth.UserService') as mock_user_service:
-        mock_instance = MagicMock()
+        mock_instance = AsyncMock()
         mock_instance.find_user_by_provider_id.return_value = MagicMock(
             id=TEST_USER_ID,
             is_deleted=False
         )
-        mock_user_service.return_value.__enter__.return_value = mock_instance
+        mock_user_service.return_value.__aenter__.return_value = mock_instance
         
         try:
             with caplog.at_level(logging.INFO):
@@ -219,12 +219,12 @@ async def test_user_deletion_invalidates_refresh_token(malformed_token, caplog):
     
     # Patch UserService to return a deleted user
     with patch('app.api.v1.endpoints.auth.UserService') as mock_user_service:
-        mock_instance = MagicMock()
+        mock_instance = AsyncMock()
         mock_instance.find_user_by_provider_id.return_value = MagicMock(
             id=TEST_USER_ID,
             is_deleted=True
         )
-        mock_user_service.return_value.__enter__.return_value = mock_instance
+        mock_user_service.return_value.__aenter__.return_value = mock_instance
         
         try:
             with caplog.at_level(logging.WARN):
@@ -243,3 +243,34 @@ async def test_user_deletion_invalidates_refresh_token(malformed_token, caplog):
                 
         finally:
             mock_user_service.reset_mock()
+
+@pytest.mark.asyncio
+async def test_logout_revokes_refresh_token(valid_refresh_token, caplog):
+    """Test that a refresh token can no longer be used after logout"""
+    
+    response = await client.post("/api/v1/auth/logout", json={
+        "refreshToken": valid_refresh_token
+    })
+    assert response.status_code == 204
+    
+    with caplog.at_level(logging.WARN):
+        response = await client.post("/api/v1/auth/refresh-token", json={
+            "refreshToken": valid_refresh_token
+        })
+        
+        # Verify response
+        assert response.status_code == 403
+        response_data = response.json()
+        assert "error" in response_data
+        assert response_data["error"] == "REFRESH_TOKEN_INVALID"
+        
+        # Verify logging
+        assert any("revoked" in log for log in caplog.messages)
+
+def test_expired_revocations_are_pruned():
+    """Test that a revoked jti is only kept until its token expires"""
+    revoke_refresh_token("expired-jti", time.time() - 1)
+    revoke_refresh_token("live-jti", time.time() + 60)
+
+    assert not is_refresh_token_revoked("expired-jti")
+    assert is_refresh_token_revoked("live-jti")
@@ -0,0 +1,87 @@
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal, engine
+from app.db.models import Media
+from app.db.models.media import make_point
+from app.db.models.enums import MediaUploadStatus
+from app.schemas.media import Media as MediaSchema
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Provide a transactional database session for tests."""
+    session = SessionLocal()
+    try:
+        session.begin()
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+@pytest.fixture(scope="function")
+def nearby_media(db_session: Session):
+    for i in range(100):
+        db_session.add(Media(
+            id=f"query-count-{i}",
+            user_id="user_123",
+            capture_time=datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            location=make_point(37.7749, -122.4194),
+            orientation_azimuth=0.0,
+            orientation_pitch=0.0,
+            orientation_roll=0.0,
+            trust_score=90.0,
+            file_path=f"bucket/query-count-{i}.jpg",
+            verification_status="VERIFIED"
+        ))
+    db_session.flush()
+
+@contextmanager
+def count_queries():
+    """Count the statements sent to the database inside the block."""
+    counter = {"count": 0}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter["count"] += 1
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+class TestMediaFilterQueryCount:
+    def test_filter_and_serialize_100_rows_in_one_query(self, db_session: Session, nearby_media):
+        with count_queries() as queries:
+            stmt = Media.filter(lat=37.7749, lng=-122.4194, radius=1000)
+            rows = db_session.execute(stmt).mappings().all()
+            serialized = [MediaSchema.model_validate(dict(row)) for row in rows]
+
+        assert len(serialized) >= 100
+        assert queries["count"] <= 2
+
+class TestMediaUploadStatus:
+    def test_pending_media_is_found_by_id_but_not_listed(self, db_session: Session):
+        db_session.add(Media(
+            id="pending-upload",
+            user_id="user_123",
+            capture_time=datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            location=make_point(37.7749, -122.4194),
+            orientation_azimuth=0.0,
+            orientation_pitch=0.0,
+            orientation_roll=0.0,
+            trust_score=90.0,
+            file_path="bucket/pending-upload.jpg",
+            verification_status="VERIFIED",
+            upload_status=MediaUploadStatus.PENDING
+        ))
+        db_session.flush()
+
+        stmt = Media.filter(lat=37.7749, lng=-122.4194, radius=1000)
+        listed = [row["id"] for row in db_session.execute(stmt).mappings()]
+        assert "pending-upload" not in listed
+
+        row = Media.find(db_session, "pending-upload")
+        assert row["upload_status"] == MediaUploadStatus.PENDING
@@ -0,0 +1,16 @@
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import Comment
+
+def compile_filter(**criteria):
+    return str(Comment._filter_statement(criteria).compile(dialect=postgresql.dialect()))
+
+class TestFilterStatement:
+    def test_filters_on_columns(self):
+        sql = compile_filter(media_id="m1", user_id="u1")
+        assert "comments.media_id = " in sql
+        assert "comments.user_id = " in sql
+
+    def test_ignores_non_column_keys(self):
+        # Methods and relationships are attributes too, but not filterable
+        assert "WHERE" not in compile_filter(create="x", unknown=1)
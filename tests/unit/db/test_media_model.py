@@ -0,0 +1,121 @@
+import time
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import Media
+from app.db.models.media import COPY_THRESHOLD, uuid7
+
+def run_list_recent(**kwargs):
+    session = MagicMock()
+    session.execute.return_value.scalars.return_value.partitions.return_value = iter([["a", "b"], ["c"]])
+    rows = list(Media.list_recent(session, **kwargs))
+    stmt = session.execute.call_args.args[0]
+    return rows, stmt
+
+class TestListRecent:
+    def test_streams_partitions_newest_first(self):
+        rows, stmt = run_list_recent(limit=3, chunk=2)
+
+        assert rows == ["a", "b", "c"]
+        assert stmt.get_execution_options()["yield_per"] == 2
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "ORDER BY media.capture_time DESC, media.id DESC" in sql
+        assert "WHERE" not in sql
+
+    def test_before_is_a_keyset_cursor(self):
+        cursor = (datetime(2025, 1, 1, tzinfo=timezone.utc), "media-id")
+        _, stmt = run_list_recent(before=cursor)
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "(media.capture_time, media.id) < (" in sql
+
+    def test_user_feed_filters_on_user(self):
+        _, stmt = run_list_recent(user_id="user-1")
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "WHERE media.user_id = " in sql
+
+class TestBulkCreate:
+    def test_single_executemany_with_generated_ids(self):
+        db = MagicMock()
+        rows = [dict(lat=1.0, lng=2.0, user_id="u", file_path="a.jpg"),
+                dict(lat=3.0, lng=4.0, user_id="u", file_path="b.jpg", thumbnail_path="t.jpg")]
+
+        ids = Media.bulk_create(db, rows)
+
+        db.execute.assert_called_once()
+        params = db.execute.call_args.args[1]
+        assert ids == [p["id"] for p in params]
+        assert len(set(ids)) == 2
+        assert params[0]["thumbnail_path"] is None
+        assert "id" not in rows[0]
+        db.commit.assert_called_once()
+
+    def test_large_batch_is_copied(self):
+        db = MagicMock()
+        cursor = db.connection.return_value.connection.cursor.return_value
+        rows = [dict(lat=1.5, lng=2.5, user_id="u", file_path=f"{i}.jpg", signature=b"\x01", capture_time=None)
+                for i in range(COPY_THRESHOLD)]
+
+        ids = Media.bulk_create(db, rows)
+
+        db.execute.assert_not_called()
+        sql, buffer = cursor.copy_expert.call_args.args
+        assert sql.startswith("COPY media (id, created_at, capture_time, location,")
+        lines = buffer.getvalue().splitlines()
+        assert len(lines) == len(ids) == COPY_THRESHOLD
+        first = lines[0].split(",")
+        assert first[0] == ids[0]
+        assert first[2] == "\\N"
+        assert first[3] == "SRID=4326;POINT(2.5 1.5)"
+        assert "\\x01" in first
+        assert "UNVERIFIED" in first
+        db.commit.assert_called_once()
+
+    def test_empty_batch_does_nothing(self):
+        db = MagicMock()
+        assert Media.bulk_create(db, []) == []
+        db.execute.assert_not_called()
+
+class TestUuid7:
+    def test_version_and_variant(self):
+        value = uuid7()
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_later_ids_sort_later(self):
+        first = uuid7()
+        time.sleep(0.002)
+        assert str(first) < str(uuid7())
+
+class TestFilterCaching:
+    def test_statement_is_cacheable_across_values(self):
+        first = Media.filter(lat=1.0, lng=2.0, radius=100, limit=10)
+        second = Media.filter(lat=3.0, lng=4.0, radius=500, limit=10)
+
+        first_key = first._generate_cache_key()
+        assert first_key is not None
+        assert first_key == second._generate_cache_key()
+
+class TestCreate:
+    def test_one_insert_returning_and_no_refresh(self):
+        db = MagicMock()
+        db.execute.return_value.one.return_value._mapping = {"id": "media-id", "file_path": "a.jpg", "user_id": "u"}
+
+        media = Media.create(
+            db, capture_time=None, lat=1.0, lng=2.0, orientation_azimuth=0.0, orientation_pitch=0.0,
+            orientation_roll=0.0, trust_score=100, user_id="u", file_path="a.jpg",
+            verification_status="VERIFIED_SIGNATURE_ONLY", signature=b"s", public_key=b"k",
+            client_media_hash=b"\x00" * 32, client_metadata_hash=b"\x00" * 32
+        )
+
+        assert (media.id, media.file_path, media.user_id) == ("media-id", "a.jpg", "u")
+        sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("INSERT INTO media") and "RETURNING" in sql
+        db.commit.assert_called_once()
+        db.refresh.assert_not_called()
+        db.add.assert_not_called()
+
@@ -0,0 +1,22 @@
+from collections import Counter
+
+import app.db.models  # noqa: F401 - registers every model on Base
+from app.db.session import Base
+
+class TestModelRegistry:
+    def test_one_mapper_per_table(self):
+        tables = Counter(mapper.local_table.name for mapper in Base.registry.mappers)
+        duplicates = [name for name, count in tables.items() if count > 1]
+        assert duplicates == []
+
+    def test_media_is_the_geography_model(self):
+        from app.db.models import Media
+        from geoalchemy2 import Geography
+        assert isinstance(Media.__table__.c.location.type, Geography)
+        assert {"orientation_azimuth", "orientation_pitch", "orientation_roll"} <= set(Media.__table__.c.keys())
+
+    def test_reference_relationships_never_lazy_load(self):
+        from app.db.models import TrustMetric, UserInteraction, Verification
+        for model in (TrustMetric, UserInteraction, Verification):
+            for relationship in model.__mapper__.relationships:
+                assert relationship.lazy == "raise_on_sql", f"{model.__name__}.{relationship.key}"
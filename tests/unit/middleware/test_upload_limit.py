@@ -0,0 +1,42 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.middleware.upload_limit import RequestSizeLimitMiddleware
+
+MAX_BODY_SIZE = 1024
+
+def make_client():
+    app = FastAPI()
+    app.add_middleware(RequestSizeLimitMiddleware, max_body_size=MAX_BODY_SIZE)
+
+    @app.post("/echo-size")
+    async def echo_size(request: Request):
+        body = await request.body()
+        return {"size": len(body)}
+
+    return TestClient(app)
+
+def chunked(data: bytes, chunk_size: int = 256):
+    for i in range(0, len(data), chunk_size):
+        yield data[i:i + chunk_size]
+
+class TestRequestSizeLimitMiddleware:
+    def test_body_within_limit_is_passed_through(self):
+        response = make_client().post("/echo-size", content=b"x" * MAX_BODY_SIZE)
+
+        assert response.status_code == 200
+        assert response.json() == {"size": MAX_BODY_SIZE}
+
+    def test_declared_content_length_over_limit_is_rejected(self):
+        response = make_client().post("/echo-size", content=b"x" * (MAX_BODY_SIZE + 1))
+
+        assert response.status_code == 413
+        assert "file too large" in response.json()["detail"].lower()
+
+    def test_chunked_body_over_limit_is_rejected_while_streaming(self):
+        # No Content-Length header, so the limit is enforced as the body is received
+        response = make_client().post("/echo-size", content=chunked(b"x" * (MAX_BODY_SIZE * 2)))
+
+        assert response.status_code == 413
+        assert "file too large" in response.json()["detail"].lower()
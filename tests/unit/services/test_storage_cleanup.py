@@ -0,0 +1,48 @@
+from unittest.mock import MagicMock, patch
+
+from app.db.models import StorageDeletion
+from app.services.storage_cleanup import process_pending_deletions
+
+def make_session(*deletions):
+    session = MagicMock()
+    session.execute.return_value.scalars.return_value.all.return_value = list(deletions)
+    return session
+
+class TestProcessPendingDeletions:
+    def test_marks_deleted_objects_done(self):
+        first = StorageDeletion(path="a.jpg", attempts=0)
+        second = StorageDeletion(path="a_thumb.jpg", attempts=0)
+        session = make_session(first, second)
+
+        with patch("app.services.storage_cleanup.delete_files", return_value={}) as delete_files:
+            assert process_pending_deletions(session) == 2
+
+        delete_files.assert_called_once()
+        assert sorted(delete_files.call_args.args[0]) == ["a.jpg", "a_thumb.jpg"]
+        assert first.done_at is not None and second.done_at is not None
+        assert first.attempts == 1
+        session.commit.assert_called_once()
+
+    def test_failure_is_recorded_for_retry(self):
+        failed = StorageDeletion(path="a.jpg", attempts=2)
+        deleted = StorageDeletion(path="b.jpg", attempts=0)
+        session = make_session(failed, deleted)
+
+        with patch("app.services.storage_cleanup.delete_files", return_value={"a.jpg": "Storage error"}):
+            assert process_pending_deletions(session) == 1
+
+        assert failed.done_at is None
+        assert failed.attempts == 3
+        assert failed.last_error == "Storage error"
+        assert deleted.done_at is not None
+        session.commit.assert_called_once()
+
+    def test_storage_exception_fails_the_whole_batch(self):
+        deletion = StorageDeletion(path="a.jpg", attempts=0)
+        session = make_session(deletion)
+
+        with patch("app.services.storage_cleanup.delete_files", side_effect=Exception("Storage error")):
+            assert process_pending_deletions(session) == 0
+
+        assert deletion.last_error == "Storage error"
+        assert deletion.done_at is None
@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services import user_service as user_service_module
+from app.services.user_service import UserService
+
+def make_user(**overrides):
+    fields = dict(id=1, provider="google", provider_id="sub-1", email="jane@example.com", is_active=True)
+    fields.update(overrides)
+    return MagicMock(**fields)
+
+def make_db(user):
+    db = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = user
+    db.execute.return_value = result
+    db.get.return_value = user
+    return db
+
+@pytest.fixture(autouse=True)
+def clear_user_caches():
+    user_service_module._users_by_provider_id.clear()
+    user_service_module._users_by_email.clear()
+    yield
+    user_service_module._users_by_provider_id.clear()
+    user_service_module._users_by_email.clear()
+
+class TestUserLookupCache:
+    @pytest.mark.asyncio
+    async def test_repeated_provider_lookup_hits_cache(self):
+        db = make_db(make_user())
+        service = UserService(db)
+
+        first = await service.find_user_by_provider_id("google", "sub-1")
+        second = await service.find_user_by_provider_id("google", "sub-1")
+
+        assert first == second
+        assert first.id == 1
+        db.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_provider_lookup_primes_email_cache(self):
+        db = make_db(make_user())
+        service = UserService(db)
+
+        await service.find_user_by_provider_id("google", "sub-1")
+        user = await service.find_user_by_email("jane@example.com")
+
+        assert user.provider_id == "sub-1"
+        db.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_user_is_not_cached(self):
+        db = make_db(None)
+        service = UserService(db)
+
+        assert await service.find_user_by_provider_id("google", "sub-1") is None
+        assert await service.find_user_by_provider_id("google", "sub-1") is None
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_user_invalidates_cache(self):
+        user = make_user()
+        db = make_db(user)
+        service = UserService(db)
+
+        await service.find_user_by_provider_id("google", "sub-1")
+        await service.delete_user(1)
+
+        assert ("google", "sub-1") not in user_service_module._users_by_provider_id
+        assert "jane@example.com" not in user_service_module._users_by_email
@@ -0,0 +1,29 @@
+import hashlib
+
+from app.services.verification import CHUNK_SIZE_BYTES, MediaHasher, hash_pair
+
+def feed(hasher, data):
+    for i in range(0, len(data), CHUNK_SIZE_BYTES):
+        hasher.update(data[i:i + CHUNK_SIZE_BYTES])
+    return hasher.digest()
+
+class TestMediaHasher:
+    def test_image_is_plain_sha256(self):
+        data = b"x" * (CHUNK_SIZE_BYTES + 10)
+        assert feed(MediaHasher("image/jpeg"), data) == hashlib.sha256(data).digest()
+
+    def test_single_chunk_video_is_its_leaf_hash(self):
+        data = b"frame"
+        assert feed(MediaHasher("video/mp4"), data) == hashlib.sha256(data).digest()
+
+    def test_video_is_merkle_root_of_chunks(self):
+        chunks = [b"a" * CHUNK_SIZE_BYTES, b"b" * CHUNK_SIZE_BYTES, b"c"]
+        leaves = [hashlib.sha256(c).digest() for c in chunks]
+        # An odd node is paired with itself
+        expected = hash_pair(hash_pair(leaves[0], leaves[1]), hash_pair(leaves[2], leaves[2]))
+
+        assert feed(MediaHasher("video/mp4"), b"".join(chunks)) == expected
+
+    def test_empty_upload(self):
+        assert MediaHasher("video/mp4").digest() == hashlib.sha256().digest()
+        assert MediaHasher("image/jpeg").digest() == hashlib.sha256().digest()
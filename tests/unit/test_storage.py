@@ -5,7 +5,7 @@ from unittest.mock import patch, mock_open, MagicMock
 import logging
 
 # Import the storage module
-from app.services.storage import save_file, delete_file
+from app.services.storage import save_file, delete_file, delete_files
 
 # Test constants
 TEST_JPEG_DATA = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00'
@@ -170,3 +170,33 @@ class TestDeleteFile:
         mock_remove.assert_called_once_with(os.path.join("storage", "test.jpg"))
         mock_log_error.assert_called_once_with("Unexpected error while deleting file test.jpg: Unexpected error")
         mock_log_warning.assert_not_called()
+
+class TestDeleteFiles:
+    @patch("app.services.storage.S3_BUCKET_NAME", "bucket")
+    @patch("app.services.storage.s3_client")
+    def test_one_request_for_all_keys(self, mock_s3):
+        # Arrange
+        mock_s3.delete_objects.return_value = {}
+
+        # Act
+        failed = delete_files(["a.mp4", "a_thumb.jpg"])
+
+        # Assert
+        assert failed == {}
+        mock_s3.delete_objects.assert_called_once_with(
+            Bucket="bucket",
+            Delete={"Objects": [{"Key": "a.mp4"}, {"Key": "a_thumb.jpg"}], "Quiet": True}
+        )
+
+    @patch("app.services.storage.S3_BUCKET_NAME", "bucket")
+    @patch("app.services.storage.s3_client")
+    def test_reports_per_key_errors(self, mock_s3):
+        # Arrange
+        mock_s3.delete_objects.return_value = {"Errors": [{"Key": "a.mp4", "Code": "AccessDenied", "Message": "Access Denied"}]}
+
+        # Act
+        failed = delete_files(["a.mp4", "b.mp4"])
+
+        # Assert
+        assert failed == {"a.mp4": "Access Denied"}
+